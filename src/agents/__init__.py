@@ -1 +1,22 @@
 # Agents package for satellite data extraction
+#
+# Agent classes are exported lazily so that importing the package (or the
+# Streamlit app) does not pull in LangChain until an agent is actually used.
+
+_EXPORTS = {
+    "BasicMissionData": "src.agents.basic_mission_data",
+    "TechnicalData": "src.agents.technical_data",
+    "LaunchData": "src.agents.launch_data",
+    "CostAndOtherData": "src.agents.cost_and_other_data",
+    "get_agent": "src.agents.registry",
+    "extract_all_sections": "src.agents.runner",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name):
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    import importlib
+    return getattr(importlib.import_module(_EXPORTS[name]), name)
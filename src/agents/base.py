@@ -0,0 +1,491 @@
+import asyncio
+import json
+import os
+import queue
+import threading
+import time
+from functools import lru_cache, partial
+from dotenv import load_dotenv
+from src.agents.control import AgentStopped, CancellationToken, RunBudget, get_budget
+from src.agents.evidence import NO_EVIDENCE
+from src.agents.observations import ObservationCompressor, compressed_tool, compressing, format_scratchpad
+from src.agents.tools import build_agent_tools, render_tools
+from src.utils.helpers import read_txt_file, extract_field_values, is_missing_value
+from src.utils.json_repair import parse_json_object
+
+# LangChain and Google GenAI are imported inside the functions that need
+# them, so importing the agents package stays cheap until an agent runs.
+
+load_dotenv()
+
+MODEL_NAME = "gemini-2.0-flash"
+
+# "react" runs the Thought/Action/Observation loop; "fast" runs the section's
+# searches in parallel and makes one structured-output call (see fast_call)
+EXTRACTION_MODES = ("react", "fast")
+DEFAULT_MODE = os.getenv("SATELLITE_EXTRACTION_MODE", "react")
+FAST_PROMPT_FILE = "fast_extraction_prompt.txt"
+# Last-resort LLM call that turns an unparseable final answer into the schema
+REFORMAT_PROMPT_FILE = "reformat_output_prompt.txt"
+REFORMAT_MAX_CHARS = 4000
+
+_llms = {}
+_llm_lock = threading.Lock()
+
+
+def get_llm(llm_cache=None, refresh=False):
+    """Shared Gemini client per cache setting, so agents reuse one client and its connections.
+
+    ``refresh`` selects the write-only view of the default cache, so the
+    client never replays a cached answer.
+    """
+    from langchain_google_genai import ChatGoogleGenerativeAI
+    from src.utils.llm_cache import get_llm_cache
+    from src.utils.rate_limit import get_limiter, LangChainRateLimiter, RateLimitFeedbackHandler
+
+    if llm_cache is None:
+        llm_cache = get_llm_cache(refresh) or False
+    key = id(llm_cache)
+    if key not in _llms:
+        with _llm_lock:
+            if key not in _llms:
+                # All agents share one Gemini rate limit that adapts to 429 / quota errors
+                limiter = get_limiter("gemini")
+                _llms[key] = ChatGoogleGenerativeAI(
+                    model=MODEL_NAME, cache=llm_cache,
+                    rate_limiter=LangChainRateLimiter(limiter),
+                    callbacks=[RateLimitFeedbackHandler(limiter)]
+                )
+    return _llms[key]
+
+
+@lru_cache(maxsize=None)
+def load_prompt(prompt_file):
+    # Get the project root directory (2 levels up from agents)
+    project_root = os.path.dirname(os.path.dirname(os.path.dirname(__file__)))
+    prompt = read_txt_file(os.path.join(project_root, "src/prompts", prompt_file))
+    if not prompt:
+        raise FileNotFoundError(f"{prompt_file} not found")
+    return prompt
+
+
+class SectionAgent:
+    """ReAct agent that extracts one section of satellite data.
+
+    Subclasses set ``section``, ``prompt_file``, ``output_model`` (the
+    pydantic model of the section), ``section_title`` and ``search_queries``
+    and implement ``get_response_schemas``.
+    ``call`` blocks on ``AgentExecutor.invoke``; ``acall`` awaits
+    ``AgentExecutor.ainvoke`` so many extractions can share one event loop.
+
+    ``llm_cache`` takes any LangChain ``BaseCache``; by default identical LLM
+    calls are answered from the local cache in ``src.utils.llm_cache``, and
+    ``False`` disables caching. A ``refresh`` agent never reads the LLM or
+    search caches (it still updates them); forced runs and field refreshes
+    use one so they do not replay an earlier answer.
+
+    Every run is bounded by a RunBudget (see src.agents.control) and can be
+    stopped through a CancellationToken; a stopped run returns the fields
+    found so far plus ``"stopped": <reason>`` instead of raising.
+    """
+
+    section = None
+    prompt_file = None
+    output_model = None
+    section_title = None
+    search_queries = []
+    # Field -> tool calls the agent may spend on it (default: control.FIELD_TOOL_BUDGET)
+    field_budgets = {}
+
+    def __init__(self, llm_cache=None, refresh=False):
+        self.refresh_caches = refresh
+        self.llm = get_llm(llm_cache, refresh)
+        # Search tools are shared by all agents and memoize results on disk;
+        # their output is compressed per run before it reaches the scratchpad
+        self.tools = [compressed_tool(tool) for tool in build_agent_tools(refresh)]
+        self._init_lock = threading.Lock()
+
+    def make_prompt(self):
+        """The agent's ReAct prompt, built once with its format instructions filled in."""
+        if not hasattr(self, 'prompt'):
+            from langchain_core.prompts import PromptTemplate
+
+            self.prompt = PromptTemplate.from_template(load_prompt(self.prompt_file)).partial(
+                format_instructions=self.get_format_instructions()
+            )
+        return self.prompt
+
+    def initialize_agent(self):
+        from langchain.agents import AgentExecutor
+        from langchain.agents.output_parsers import ReActSingleInputOutputParser
+        from langchain_core.runnables import RunnablePassthrough
+
+        # create_react_agent, but with compact tool descriptions and a
+        # scratchpad that shortens old observations (see src.agents.observations)
+        prompt = self.make_prompt().partial(
+            tools=render_tools(self.tools),
+            tool_names=", ".join(tool.name for tool in self.tools)
+        )
+        self.agent = (
+            RunnablePassthrough.assign(agent_scratchpad=lambda x: format_scratchpad(x["intermediate_steps"]))
+            | prompt
+            | self.llm.bind(stop=["\nObservation"])
+            | ReActSingleInputOutputParser()
+        )
+        self.agent_executor = AgentExecutor(
+            agent=self.agent,
+            tools=self.tools,
+            verbose=True,
+            handle_parsing_errors=True,
+            # Iteration and time limits are enforced per run by RunControlHandler
+            max_iterations=None
+        )
+        return self.agent_executor
+
+    def get_response_schemas(self):
+        raise NotImplementedError
+
+    def get_format_instructions(self):
+        if not hasattr(self, 'output_parser'):
+            from langchain.output_parsers import StructuredOutputParser
+            self.output_parser = StructuredOutputParser.from_response_schemas(self.get_response_schemas())
+        return self.output_parser.get_format_instructions()
+
+    def _build_input(self, satellite_name, evidence=None):
+        if not hasattr(self, 'agent_executor'):
+            with self._init_lock:
+                if not hasattr(self, 'agent_executor'):
+                    self.get_format_instructions()
+                    self.initialize_agent()
+        # Tools, tool names and format instructions are already part of the prompt
+        return {
+            "satellite_name": satellite_name,
+            "evidence": evidence or NO_EVIDENCE
+        }
+
+    def _parse_output(self, satellite_name, result, control=None):
+        try:
+            parsed_result = self.output_parser.parse(result["output"])
+            return parsed_result
+        except Exception as parse_error:
+            salvaged = self._salvage(satellite_name, result["output"], control)
+            if salvaged is not None:
+                return salvaged
+            print(f"Error parsing output for {satellite_name}: {parse_error}")
+            return {
+                "error": f"Parsing error: {parse_error}",
+                "raw_output": result["output"],
+                "satellite_name": satellite_name
+            }
+
+    def _salvage(self, satellite_name, output, control=None):
+        """Recover a result from a final answer the output parser rejected, or None.
+
+        Tries a tolerant JSON parse of the answer first, then fills the gaps
+        from the fields recorded in the scratchpad. Only if the answer holds
+        no readable JSON and fields are still missing is the LLM asked to
+        reformat it.
+        """
+        fields = [schema.name for schema in self.get_response_schemas()]
+        data = parse_json_object(output) or {}
+        result = {name: data.get(name) for name in fields}
+        steps = ["json repair"] if any(name in data for name in fields) else []
+        if control is not None:
+            recovered = extract_field_values("\n".join(control.transcript), fields)
+            recovered.update({name: value for name, value in control.values.items() if value is not None})
+            filled = [name for name in fields if is_missing_value(result[name]) and not is_missing_value(recovered.get(name))]
+            for name in filled:
+                result[name] = recovered[name]
+            if filled:
+                steps.append("scratchpad")
+        if "json repair" not in steps and self.missing_fields(result) and output and output.strip():
+            reformatted = self._reformat(satellite_name, output)
+            filled = [name for name in fields if is_missing_value(result[name]) and not is_missing_value(reformatted.get(name))]
+            for name in filled:
+                result[name] = reformatted[name]
+            if filled:
+                steps.append("reformat")
+        if not steps:
+            return None
+        print(f"Salvaged unparseable output for {satellite_name} ({', '.join(steps)})")
+        return result
+
+    def _reformat(self, satellite_name, output):
+        try:
+            if not hasattr(self, 'reformat_chain'):
+                from langchain_core.prompts import PromptTemplate
+                prompt = PromptTemplate.from_template(load_prompt(REFORMAT_PROMPT_FILE))
+                self.reformat_chain = prompt | self.llm.with_structured_output(self.output_model)
+            data = self.reformat_chain.invoke({"satellite_name": satellite_name, "text": output[-REFORMAT_MAX_CHARS:]})
+        except Exception as e:
+            print(f"Could not reformat output for {satellite_name}: {e}")
+            return {}
+        return data.model_dump() if data is not None else {}
+
+    def _tracked_result(self, satellite_name, control):
+        """Result of a run that ended because every field was reported on a Found line."""
+        print(f"All fields found for {satellite_name} after {control.iterations} steps")
+        return {schema.name: control.values.get(schema.name) for schema in self.get_response_schemas()}
+
+    def _partial_result(self, satellite_name, reason, control):
+        if reason == "field_budget":
+            print(f"Agent for {satellite_name} ran out of tool budget for {', '.join(control.exhausted_fields())}")
+        else:
+            print(f"Agent for {satellite_name} stopped early: {reason}")
+        transcript = "\n".join(control.transcript)
+        fields = [schema.name for schema in self.get_response_schemas()]
+        result = extract_field_values(transcript, fields)
+        result.update({name: value for name, value in control.values.items() if name in result and value is not None})
+        result.update({
+            "stopped": reason,
+            "raw_output": transcript,
+            "satellite_name": satellite_name
+        })
+        return result
+
+    def _error_result(self, satellite_name, error):
+        print(f"Error extracting data for {satellite_name}: {error}")
+        return {
+            "error": str(error),
+            "satellite_name": satellite_name,
+            "data": None
+        }
+
+    def _control(self, cancel_token, budget, fields=None):
+        """RunControlHandler for one run; it tracks ``fields`` (default: every value field)."""
+        from src.agents.streaming import RunControlHandler
+        fields = fields or self.value_fields()
+        return RunControlHandler(cancel_token, budget or get_budget(self.section), fields, self.field_budgets)
+
+    @classmethod
+    def value_fields(cls):
+        """Schema fields that hold data rather than source URLs."""
+        return [name for name in cls.output_model.model_fields if "source" not in name]
+
+    @classmethod
+    def source_field(cls, name):
+        """The field holding the source URL of value field ``name``, or None if it has none."""
+        sources = [field for field in cls.output_model.model_fields if "source" in field]
+        matches = [field for field in sources if name.startswith(field.split("_source")[0])]
+        return max(matches, key=len) if matches else None
+
+    def missing_fields(self, result):
+        """Value fields (not source fields) that are empty in a result."""
+        return [name for name in self.value_fields() if is_missing_value(result.get(name))]
+
+    @staticmethod
+    def _focus_evidence(evidence, known, missing):
+        """Evidence for a ReAct run that should only look for ``missing`` and keep ``known``."""
+        return (
+            f"{evidence or NO_EVIDENCE}\n\nAlready extracted (keep these values, only search for {', '.join(missing)}):\n"
+            f"{json.dumps(known)}"
+        )
+
+    def _fast_chain(self):
+        if not hasattr(self, 'fast_chain'):
+            from langchain_core.prompts import PromptTemplate
+            prompt = PromptTemplate.from_template(load_prompt(FAST_PROMPT_FILE))
+            self.fast_chain = prompt | self.llm.with_structured_output(self.output_model)
+        return self.fast_chain
+
+    def fast_call(self, satellite_name, evidence=None, callbacks=None, cancel_token=None, budget=None, fallback=True):
+        """Fast mode: run ``search_queries`` in parallel, then one structured-output LLM call.
+
+        Value fields still empty afterwards are filled by a ReAct run that
+        starts from the same search results and tracks only those fields,
+        unless ``fallback`` is False.
+        """
+        from src.agents.evidence import gather_evidence
+        from src.agents.tools import build_search_tools
+
+        budget = budget or get_budget(self.section)
+        control = self._control(cancel_token, budget)
+        started = time.time()
+        try:
+            control.check()
+            found = gather_evidence(satellite_name, tools=build_search_tools(self.refresh_caches), queries=self.search_queries)
+            if evidence and evidence != NO_EVIDENCE:
+                found = f"{found}\n\nShared evidence:\n{evidence}"
+            control.check()
+            data = self._fast_chain().invoke(
+                {"satellite_name": satellite_name, "section_title": self.section_title, "evidence": found},
+                config={"callbacks": [control] + list(callbacks or [])}
+            )
+            result = data.model_dump() if data is not None else {name: None for name in self.output_model.model_fields}
+        except AgentStopped as e:
+            return self._partial_result(satellite_name, e.reason, control)
+        except Exception as e:
+            return self._error_result(satellite_name, e)
+
+        missing = self.missing_fields(result)
+        if not fallback or not missing:
+            return result
+        print(f"Fast mode left {', '.join(missing)} empty for {satellite_name}; falling back to the ReAct agent")
+        known = {name: value for name, value in result.items() if not is_missing_value(value)}
+        react_evidence = self._focus_evidence(found, known, missing)
+        remaining = budget.max_seconds - (time.time() - started) if budget.max_seconds else None
+        # Track only the missing fields, so the run ends once they are found or out of tool budget
+        react = self._react(
+            satellite_name, react_evidence, callbacks,
+            self._control(cancel_token, RunBudget(max_seconds=remaining, max_iterations=budget.max_iterations), fields=missing)
+        )
+        if "error" in react:
+            return result
+        for name in self.output_model.model_fields:
+            if is_missing_value(result.get(name)) and not is_missing_value(react.get(name)):
+                result[name] = react[name]
+        if react.get("stopped") == "cancelled":
+            result["stopped"] = "cancelled"
+        return result
+
+    def call(self, satellite_name, evidence=None, callbacks=None, cancel_token=None, budget=None, mode=None):
+        """Extract this section.
+
+        ``evidence`` is a pre-gathered bundle from src.agents.evidence,
+        ``callbacks`` are LangChain callback handlers for this run only, and
+        ``cancel_token``/``budget`` bound the run (budget defaults to the
+        section's entry in src.agents.control.SECTION_BUDGETS). ``mode`` is
+        one of EXTRACTION_MODES (default: SATELLITE_EXTRACTION_MODE).
+        """
+        if (mode or DEFAULT_MODE) == "fast":
+            return self.fast_call(satellite_name, evidence, callbacks, cancel_token, budget)
+        return self._react(satellite_name, evidence, callbacks, self._control(cancel_token, budget))
+
+    def _react(self, satellite_name, evidence, callbacks, control):
+        try:
+            control.check()
+            input_data = self._build_input(satellite_name, evidence)
+            with compressing(ObservationCompressor(self.output_model, control.open_fields)):
+                result = self.agent_executor.invoke(input_data, config={"callbacks": [control] + list(callbacks or [])})
+            return self._parse_output(satellite_name, result, control)
+        except AgentStopped as e:
+            if e.reason == "complete":
+                return self._tracked_result(satellite_name, control)
+            return self._partial_result(satellite_name, e.reason, control)
+        except Exception as e:
+            return self._error_result(satellite_name, e)
+
+    def refresh(self, satellite_name, cached, fields, evidence=None, callbacks=None, cancel_token=None, budget=None):
+        """Re-extract only ``fields`` of a cached result and return the cached result with them updated.
+
+        Runs the ReAct agent told to keep the cached values and search only
+        for ``fields``. Only those fields are tracked, so the run ends as
+        soon as they are found or out of tool budget, and the section budget
+        is scaled down to their share of the schema. A new value (and its
+        source) replaces the cached one; fields still not found keep theirs.
+        """
+        fields = [name for name in fields if name in self.value_fields()]
+        if not fields:
+            return cached
+        known = {
+            name: value for name, value in cached.items()
+            if name in self.output_model.model_fields and name not in fields and not is_missing_value(value)
+        }
+        budget = (budget or get_budget(self.section)).scaled(len(fields) / len(self.value_fields()))
+        print(f"Refreshing {', '.join(fields)} of {self.section} for {satellite_name}")
+        result = self._react(
+            satellite_name, self._focus_evidence(evidence, known, fields), callbacks,
+            self._control(cancel_token, budget, fields=fields)
+        )
+        if "error" in result:
+            return result
+        merged = {name: cached.get(name) for name in self.output_model.model_fields}
+        for name in fields:
+            if is_missing_value(result.get(name)):
+                continue
+            merged[name] = result[name]
+            source = self.source_field(name)
+            if source and not is_missing_value(result.get(source)):
+                merged[source] = result[source]
+        for key in ("stopped", "raw_output", "satellite_name"):
+            if key in result:
+                merged[key] = result[key]
+        return merged
+
+    async def acall(self, satellite_name, evidence=None, callbacks=None, cancel_token=None, budget=None, mode=None):
+        if (mode or DEFAULT_MODE) == "fast":
+            # Fast mode is a handful of parallel searches plus one LLM call; run it off the loop
+            return await asyncio.get_running_loop().run_in_executor(
+                None, partial(self.fast_call, satellite_name, evidence, callbacks, cancel_token, budget)
+            )
+        control = self._control(cancel_token, budget)
+        try:
+            control.check()
+            input_data = self._build_input(satellite_name, evidence)
+            # Also enforce the wall-clock budget while awaiting a slow LLM or search call
+            with compressing(ObservationCompressor(self.output_model, control.open_fields)):
+                result = await asyncio.wait_for(
+                    self.agent_executor.ainvoke(input_data, config={"callbacks": [control] + list(callbacks or [])}),
+                    timeout=control.budget.max_seconds or None
+                )
+            # Salvaging an unparseable answer may need a blocking LLM call
+            return await asyncio.get_running_loop().run_in_executor(
+                None, partial(self._parse_output, satellite_name, result, control)
+            )
+        except AgentStopped as e:
+            if e.reason == "complete":
+                return self._tracked_result(satellite_name, control)
+            return self._partial_result(satellite_name, e.reason, control)
+        except asyncio.TimeoutError:
+            return self._partial_result(satellite_name, "timeout", control)
+        except Exception as e:
+            return self._error_result(satellite_name, e)
+
+    def stream(self, satellite_name, evidence=None, cancel_token=None, budget=None, mode=None):
+        """Run ``call`` in a worker thread and yield its ReAct events as they happen.
+
+        Yields the event dicts of src.agents.streaming.AgentEventHandler and
+        finally ``{"type": "result", "result": <call() result>}``. Closing the
+        generator early (e.g. a Streamlit rerun) cancels the run.
+        """
+        from src.agents.streaming import AgentEventHandler
+
+        cancel_token = cancel_token or CancellationToken()
+        events = queue.Queue()
+
+        def run():
+            result = self.call(
+                satellite_name, evidence=evidence, callbacks=[AgentEventHandler(events.put)],
+                cancel_token=cancel_token, budget=budget, mode=mode
+            )
+            events.put({"type": "result", "result": result})
+
+        threading.Thread(target=run, name=f"{type(self).__name__}-stream", daemon=True).start()
+        finished = False
+        try:
+            while True:
+                event = events.get()
+                finished = event["type"] == "result"
+                yield event
+                if finished:
+                    return
+        finally:
+            if not finished:
+                cancel_token.cancel()
+
+    async def astream(self, satellite_name, evidence=None, cancel_token=None, budget=None, mode=None):
+        """Async counterpart of ``stream`` built on ``acall``."""
+        from src.agents.streaming import AgentEventHandler
+
+        loop = asyncio.get_running_loop()
+        events = asyncio.Queue()
+        # Sync handlers may be called from executor threads, so hop back onto the loop
+        handler = AgentEventHandler(lambda event: loop.call_soon_threadsafe(events.put_nowait, event))
+
+        async def run():
+            result = await self.acall(
+                satellite_name, evidence=evidence, callbacks=[handler],
+                cancel_token=cancel_token, budget=budget, mode=mode
+            )
+            await events.put({"type": "result", "result": result})
+
+        task = asyncio.ensure_future(run())
+        try:
+            while True:
+                event = await events.get()
+                yield event
+                if event["type"] == "result":
+                    return
+        finally:
+            if not task.done():
+                task.cancel()
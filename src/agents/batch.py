@@ -0,0 +1,160 @@
+"""Batch extraction over a file of satellite names.
+
+Usage:
+    python -m src.agents.batch satellites.txt -o results.jsonl --workers 8
+
+Each satellite x section pair is one job on a bounded worker pool (with
+--combined, each satellite is one job that fills all its sections in a
+single agent run). Every finished section is appended to the output file as
+one JSON line. Jobs whose
+section is already in the cache are skipped, and successful results are
+cached as they finish. Re-running the same command after an interruption
+picks up where it stopped.
+"""
+import argparse
+import json
+import os
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+from dotenv import load_dotenv
+
+from src.agents.base import EXTRACTION_MODES
+from src.agents.evidence import evidence_for
+from src.agents.registry import get_agent
+from src.agents.registry import COMBINED
+from src.agents.runner import extract_section, extract_combined
+from src.utils.cache import SECTIONS, get_from_cache, normalize_satellite_name, is_cacheable
+
+
+def read_satellite_names(path):
+    """Read one satellite name per line, skipping blanks, '#' comments and duplicates."""
+    names = []
+    seen = set()
+    with open(path, 'r', encoding='utf-8') as f:
+        for line in f:
+            name = line.strip()
+            if not name or name.startswith('#'):
+                continue
+            key = normalize_satellite_name(name)
+            if key in seen:
+                continue
+            seen.add(key)
+            names.append(name)
+    return names
+
+
+def plan_jobs(names, sections, force_run=False):
+    """Yield (satellite_name, section) pairs that still need an agent run."""
+    for name in names:
+        for section in sections:
+            if force_run or not get_from_cache(name, section):
+                yield name, section
+
+
+def plan_combined_jobs(names, sections, force_run=False):
+    """Yield (satellite_name, [sections]) for satellites with at least one section still to extract."""
+    for name in names:
+        pending = [section for section in sections if force_run or not get_from_cache(name, section)]
+        if pending:
+            yield name, pending
+
+
+def _record(satellite_name, section, result, started):
+    return {
+        "satellite_name": satellite_name,
+        "section": section,
+        "status": "success" if is_cacheable(result) else "error",
+        "elapsed_seconds": round(time.time() - started, 2),
+        "data": result,
+    }
+
+
+def _run_job(agents, satellite_name, section, sections=None, force_run=False, mode=None):
+    """Run one planned job; a COMBINED job fills ``sections`` (from plan_combined_jobs) in one agent run."""
+    started = time.time()
+    if section == COMBINED:
+        return _run_combined_job(satellite_name, sections, force_run, mode)
+    # Sections of the same satellite share one evidence bundle (search results are cached on disk too)
+    evidence = evidence_for(satellite_name, refresh=force_run) if len(agents) > 1 else None
+    result, _ = extract_section(satellite_name, section, force_run=force_run, agent=agents[section], evidence=evidence, mode=mode)
+    return [_record(satellite_name, section, result, started)]
+
+
+def _run_combined_job(satellite_name, sections, force_run, mode=None):
+    started = time.time()
+    results, from_cache = extract_combined(
+        satellite_name, sections, force_run=force_run, evidence=evidence_for(satellite_name, refresh=force_run), mode=mode
+    )
+    return [_record(satellite_name, section, results[section], started) for section in sections if not from_cache[section]]
+
+
+def run_batch(names, output_path, sections=SECTIONS, workers=4, force_run=False, mode=None, combined=False):
+    """Run all pending jobs and append one JSON line per finished job to output_path.
+
+    At most ``workers`` jobs run at once and at most ``2 * workers`` are
+    queued, so memory stays flat for catalogs of any size. Returns a summary
+    dict with success/error counts.
+    """
+    if combined:
+        agents = {COMBINED: get_agent(COMBINED, force_run)}
+        jobs = ((name, COMBINED, pending) for name, pending in plan_combined_jobs(names, sections, force_run=force_run))
+    else:
+        agents = {section: get_agent(section, force_run) for section in sections}
+        jobs = plan_jobs(names, sections, force_run=force_run)
+    summary = {"success": 0, "error": 0}
+    executor = ThreadPoolExecutor(max_workers=workers)
+    pending = set()
+    try:
+        with open(output_path, 'a', encoding='utf-8') as out:
+            exhausted = False
+            while pending or not exhausted:
+                while not exhausted and len(pending) < 2 * workers:
+                    job = next(jobs, None)
+                    if job is None:
+                        exhausted = True
+                        break
+                    pending.add(executor.submit(_run_job, agents, *job, force_run=force_run, mode=mode))
+                if not pending:
+                    break
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    for record in future.result():
+                        summary[record["status"]] += 1
+                        out.write(json.dumps(record) + "\n")
+                        out.flush()
+                        print(f"[{record['status']}] {record['satellite_name']} / {record['section']} ({record['elapsed_seconds']}s)")
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+    return summary
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Extract satellite data for a list of satellites.")
+    parser.add_argument("input", help="Text file with one satellite name per line")
+    parser.add_argument("-o", "--output", default="satellite_results.jsonl", help="JSONL file to append results to")
+    parser.add_argument("-w", "--workers", type=int, default=4, help="Number of agent runs in flight at once")
+    parser.add_argument("-s", "--sections", nargs="+", choices=SECTIONS, default=SECTIONS, help="Sections to extract")
+    parser.add_argument("--force", action="store_true", help="Re-run sections even if they are already cached")
+    parser.add_argument("--mode", choices=EXTRACTION_MODES, default=None,
+                        help="react: step-by-step agent; fast: parallel searches and one structured LLM call per section")
+    parser.add_argument("--combined", action="store_true", help="Extract all sections of a satellite in one agent run")
+    args = parser.parse_args(argv)
+
+    load_dotenv()
+    names = read_satellite_names(args.input)
+    print(f"Batch extraction: {len(names)} satellites x {len(args.sections)} sections, {args.workers} workers")
+    try:
+        summary = run_batch(names, args.output, sections=args.sections, workers=args.workers, force_run=args.force, mode=args.mode, combined=args.combined)
+    except KeyboardInterrupt:
+        print("\nInterrupted. Finished jobs are cached; re-run the same command to resume.")
+        return 130
+    print(f"Done: {summary['success']} succeeded, {summary['error']} failed. Results in {args.output}")
+    return 0 if summary["error"] == 0 else 1
+
+
+if __name__ == "__main__":
+    sys.exit(main())
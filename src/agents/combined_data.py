@@ -0,0 +1,47 @@
+from src.agents.base import SectionAgent
+from src.agents.basic_mission_data import BasicMissionData, BasicSatelliteData
+from src.agents.technical_data import TechnicalData, TechnicalSatelliteData
+from src.agents.launch_data import LaunchData, LaunchDataModel
+from src.agents.cost_and_other_data import CostAndOtherData, CostAndOtherDataModel
+
+# Cache section -> agent class whose fields make up that part of the combined result
+COMBINED_SECTIONS = {
+    "basic": BasicMissionData,
+    "technical": TechnicalData,
+    "launch": LaunchData,
+    "cost": CostAndOtherData,
+}
+
+
+class CombinedSatelliteData(BasicSatelliteData, TechnicalSatelliteData, LaunchDataModel, CostAndOtherDataModel):
+    """Union of the four section models."""
+
+
+class CombinedData(SectionAgent):
+    """Extracts all four sections in one agent session with one shared scratchpad.
+
+    ``split_result`` turns its output back into the per-section results the
+    cache stores.
+    """
+    section = "combined"
+    prompt_file = "combined_data_prompt.txt"
+    output_model = CombinedSatelliteData
+    section_title = "complete profile (basic mission, technical, launch vehicle and cost data)"
+    search_queries = [query for agent in COMBINED_SECTIONS.values() for query in agent.search_queries]
+    field_budgets = {name: budget for agent in COMBINED_SECTIONS.values() for name, budget in agent.field_budgets.items()}
+
+    def get_response_schemas(self):
+        # The section agents' schemas do not depend on instance state
+        return [schema for agent in COMBINED_SECTIONS.values() for schema in agent.get_response_schemas(self)]
+
+    def split_result(self, result):
+        """Return {section: result} with each section's fields; errors and stop reasons go to every section."""
+        extra = {key: result[key] for key in ("error", "stopped", "raw_output", "satellite_name", "data") if key in result}
+        split = {}
+        for section, agent in COMBINED_SECTIONS.items():
+            fields = [schema.name for schema in agent.get_response_schemas(self)]
+            if "error" in result:
+                split[section] = dict(extra)
+            else:
+                split[section] = {**{name: result.get(name) for name in fields}, **extra}
+        return split
@@ -0,0 +1,73 @@
+import math
+import os
+import threading
+
+
+class AgentStopped(Exception):
+    """Raised inside an agent run when it is cancelled or exceeds its budget."""
+
+    def __init__(self, reason):
+        super().__init__(f"Agent stopped: {reason}")
+        self.reason = reason
+
+
+class CancellationToken:
+    """Thread-safe flag checked by a running agent between ReAct steps and tool calls."""
+
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+
+class RunBudget:
+    """Wall-clock and ReAct-iteration limits for one agent run (None means unlimited)."""
+
+    def __init__(self, max_seconds=None, max_iterations=None):
+        self.max_seconds = max_seconds
+        self.max_iterations = max_iterations
+
+    def scaled(self, share, min_seconds=30, min_iterations=3):
+        """A budget for ``share`` (0-1) of the work, e.g. refreshing a few fields of a section."""
+        return RunBudget(
+            max_seconds=self.max_seconds and max(min_seconds, self.max_seconds * share),
+            max_iterations=self.max_iterations and max(min_iterations, math.ceil(self.max_iterations * share))
+        )
+
+    def __repr__(self):
+        return f"RunBudget(max_seconds={self.max_seconds}, max_iterations={self.max_iterations})"
+
+
+# Tool calls an agent may spend on one field before it is given up as null;
+# agents can override this per field through SectionAgent.field_budgets
+FIELD_TOOL_BUDGET = int(os.getenv("SATELLITE_FIELD_TOOL_BUDGET", "4"))
+
+
+def _env_number(name, default):
+    value = os.getenv(name)
+    return float(value) if value else default
+
+
+# Per-section defaults; SATELLITE_MAX_SECONDS / SATELLITE_MAX_ITERATIONS override all sections
+SECTION_BUDGETS = {
+    "basic": RunBudget(max_seconds=150, max_iterations=12),
+    "technical": RunBudget(max_seconds=180, max_iterations=15),
+    "launch": RunBudget(max_seconds=150, max_iterations=12),
+    "cost": RunBudget(max_seconds=120, max_iterations=10),
+    # One run for all four sections: cheaper than their sum, since searches answer several sections
+    "combined": RunBudget(max_seconds=360, max_iterations=28),
+}
+
+
+def get_budget(section):
+    budget = SECTION_BUDGETS.get(section, RunBudget(max_seconds=180, max_iterations=15))
+    max_iterations = _env_number("SATELLITE_MAX_ITERATIONS", budget.max_iterations)
+    return RunBudget(
+        max_seconds=_env_number("SATELLITE_MAX_SECONDS", budget.max_seconds),
+        max_iterations=int(max_iterations) if max_iterations else None,
+    )
@@ -0,0 +1,126 @@
+import asyncio
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from src.agents.tools import SEARCH_CACHE_TTL, build_search_tools, parse_search_results, normalize_url
+from src.utils.cache import normalize_satellite_name
+from src.utils.singleflight import SingleFlight
+
+# Broad queries that between them cover the four data sections
+EVIDENCE_QUERIES = [
+    "{satellite_name} satellite mission overview orbit altitude payloads",
+    "{satellite_name} satellite instruments sensors spectral bands resolution",
+    "{satellite_name} launch vehicle launch date launch mass",
+    "{satellite_name} mission cost budget launch cost",
+]
+
+# Shown to the agents when no evidence was gathered
+NO_EVIDENCE = "None collected yet. Use the tools to search."
+
+# Number of search tools (in build_search_tools order) each evidence query is sent to
+EVIDENCE_PROVIDERS = 2
+EVIDENCE_MAX_CHARS = 6000
+
+
+def dedupe_results(results):
+    """Drop results whose URL or snippet was already seen, keeping first occurrences."""
+    seen_urls = set()
+    seen_snippets = set()
+    unique = []
+    for item in results:
+        url = normalize_url(item["url"]) if item["url"] else ""
+        snippet = " ".join(item["snippet"].split()).lower()
+        if (url and url in seen_urls) or (snippet and snippet in seen_snippets):
+            continue
+        if url:
+            seen_urls.add(url)
+        if snippet:
+            seen_snippets.add(snippet)
+        unique.append(item)
+    return unique
+
+
+def format_evidence(results, max_chars=EVIDENCE_MAX_CHARS):
+    """Render deduped search results as a numbered evidence list, capped at max_chars."""
+    lines = []
+    used = 0
+    for i, item in enumerate(results, 1):
+        entry = f"[{i}] {item['title']} ({item['url'] or 'no url'})\n{item['snippet']}"
+        if used + len(entry) > max_chars:
+            break
+        lines.append(entry)
+        used += len(entry) + 1
+    return "\n".join(lines) if lines else NO_EVIDENCE
+
+
+def _evidence_jobs(satellite_name, tools, queries):
+    return [
+        (tool, query.format(satellite_name=satellite_name))
+        for query in queries
+        for tool in tools[:EVIDENCE_PROVIDERS]
+    ]
+
+
+def _run_search(tool, query):
+    try:
+        return parse_search_results(tool.invoke(query))
+    except Exception as e:
+        print(f"Evidence search failed ({tool.name}: {query}): {e}")
+        return []
+
+
+def gather_evidence(satellite_name, tools=None, max_chars=EVIDENCE_MAX_CHARS, queries=EVIDENCE_QUERIES):
+    """Run the evidence queries in parallel and return the formatted, deduped bundle."""
+    jobs = _evidence_jobs(satellite_name, tools or build_search_tools(), queries)
+    with ThreadPoolExecutor(max_workers=len(jobs)) as executor:
+        batches = list(executor.map(lambda job: _run_search(*job), jobs))
+    return format_evidence(dedupe_results([item for batch in batches for item in batch]), max_chars)
+
+
+async def agather_evidence(satellite_name, tools=None, max_chars=EVIDENCE_MAX_CHARS, queries=EVIDENCE_QUERIES):
+    async def run(tool, query):
+        try:
+            return parse_search_results(await tool.ainvoke(query))
+        except Exception as e:
+            print(f"Evidence search failed ({tool.name}: {query}): {e}")
+            return []
+
+    jobs = _evidence_jobs(satellite_name, tools or build_search_tools(), queries)
+    batches = await asyncio.gather(*(run(tool, query) for tool, query in jobs))
+    return format_evidence(dedupe_results([item for batch in batches for item in batch]), max_chars)
+
+
+_recent = OrderedDict()
+_recent_lock = threading.Lock()
+_gathering = SingleFlight()
+
+
+def evidence_for(satellite_name, refresh=False, maxsize=256, ttl=SEARCH_CACHE_TTL):
+    """gather_evidence memoized per satellite for ``ttl`` seconds.
+
+    Lets independent per-section jobs (e.g. in a batch) for the same
+    satellite share one bundle; jobs that start together wait for a single
+    gathering pass. A bundle is kept no longer than the search results it
+    was built from. ``refresh`` gathers a new bundle, bypassing the search
+    cache, and replaces the memoized one.
+    """
+    key = normalize_satellite_name(satellite_name)
+    with _recent_lock:
+        entry = _recent.get(key)
+        if entry is not None and not refresh:
+            gathered_at, evidence = entry
+            if time.time() - gathered_at < ttl:
+                _recent.move_to_end(key)
+                return evidence
+            del _recent[key]
+    evidence, _ = _gathering.do(
+        (key, refresh), lambda: gather_evidence(satellite_name, tools=build_search_tools(refresh))
+    )
+    with _recent_lock:
+        _recent[key] = (time.time(), evidence)
+        _recent.move_to_end(key)
+        while len(_recent) > maxsize:
+            _recent.popitem(last=False)
+    return evidence
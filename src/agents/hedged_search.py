@@ -0,0 +1,277 @@
+import asyncio
+import os
+import threading
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+
+from src.agents.evidence import dedupe_results, format_evidence
+from src.agents.tools import parse_search_results, is_error_result
+
+# Seconds the composite search waits for providers before returning what it has
+SEARCH_DEADLINE = float(os.getenv("SATELLITE_SEARCH_DEADLINE", "6"))
+# A provider answer with at least this many results is returned immediately
+MIN_GOOD_RESULTS = 3
+# Hedge delay used for a provider with no latency history yet
+DEFAULT_HEDGE_DELAY = 1.0
+# Latency samples kept per provider
+LATENCY_WINDOW = 200
+SEARCH_RESULT_MAX_CHARS = 4000
+
+# Threads running provider calls for the sync web_search. Calls that lose the
+# race keep their thread until they finish, so keep this above the providers'
+# combined concurrency ceilings (see src.utils.rate_limit)
+HEDGE_WORKERS = int(os.getenv("SATELLITE_HEDGE_WORKERS", "32"))
+# Seconds between looks for a free provider when all remaining ones are busy
+CAPACITY_RECHECK = 0.1
+
+_executor = ThreadPoolExecutor(max_workers=HEDGE_WORKERS, thread_name_prefix="hedged-search")
+# Async provider calls that lost the race, referenced until they finish
+_background = set()
+
+
+class LatencyTracker:
+    """Rolling per-provider latency samples and failure counts."""
+
+    def __init__(self, window=LATENCY_WINDOW):
+        self.window = window
+        self._samples = {}
+        self._failures = {}
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def record(self, provider, seconds, ok=True):
+        with self._lock:
+            self._samples.setdefault(provider, deque(maxlen=self.window)).append(seconds)
+            self._calls[provider] = self._calls.get(provider, 0) + 1
+            if not ok:
+                self._failures[provider] = self._failures.get(provider, 0) + 1
+
+    def percentile(self, provider, pct):
+        with self._lock:
+            samples = sorted(self._samples.get(provider, ()))
+        if not samples:
+            return None
+        return samples[min(len(samples) - 1, int(len(samples) * pct / 100))]
+
+    def failure_rate(self, provider):
+        with self._lock:
+            calls = self._calls.get(provider, 0)
+            return self._failures.get(provider, 0) / calls if calls else 0.0
+
+    def score(self, provider):
+        """Expected seconds to a usable answer; providers without history score 0 so they get tried."""
+        p50 = self.percentile(provider, 50)
+        if p50 is None:
+            return 0.0
+        return p50 / max(0.05, 1.0 - self.failure_rate(provider))
+
+    def stats(self):
+        with self._lock:
+            providers = list(self._calls)
+        return {
+            provider: {
+                "calls": self._calls[provider],
+                "p50": self.percentile(provider, 50),
+                "p90": self.percentile(provider, 90),
+                "p99": self.percentile(provider, 99),
+                "failure_rate": round(self.failure_rate(provider), 3),
+            }
+            for provider in providers
+        }
+
+
+_tracker = LatencyTracker()
+
+
+def get_latency_tracker():
+    return _tracker
+
+
+def timed_tool(tool, tracker=None):
+    """Wrap a search tool so the latency and outcome of every call are recorded under its name."""
+    from langchain_core.tools import Tool
+
+    tracker = tracker or _tracker
+    inner_config = {"callbacks": []}
+
+    def run(query):
+        started = time.monotonic()
+        try:
+            result = tool.invoke(query, config=inner_config)
+        except Exception:
+            tracker.record(tool.name, time.monotonic() - started, ok=False)
+            raise
+        tracker.record(tool.name, time.monotonic() - started, ok=not is_error_result(result))
+        return result
+
+    async def arun(query):
+        started = time.monotonic()
+        try:
+            result = await tool.ainvoke(query, config=inner_config)
+        except Exception:
+            tracker.record(tool.name, time.monotonic() - started, ok=False)
+            raise
+        tracker.record(tool.name, time.monotonic() - started, ok=not is_error_result(result))
+        return result
+
+    return Tool(name=tool.name, description=tool.description, func=run, coroutine=arun)
+
+
+class HedgedSearch:
+    """Sends a query to several providers, fastest first, and returns the first good answer.
+
+    Providers are ranked by their recent latency. The fastest one is called
+    right away; if it has not answered within its usual (p75) latency, the
+    next one is started as a hedge, and so on; a provider that fails or answers
+    with too few results starts the next one at once. The first answer with
+    at least ``min_results`` results wins. If none qualifies by ``deadline``, whatever
+    arrived is merged and deduped. Slower calls keep running in the
+    background so their results still reach the search cache; hedges that
+    have not started yet are cancelled.
+
+    ``limiters`` maps tool names to their provider's AdaptiveRateLimiter. A
+    provider at its concurrency limit (or paused after a 429) is passed over
+    for the next one, so calls do not sit waiting for a slot, unless nothing
+    else is in flight. ``run`` uses a shared thread pool; ``arun`` runs the
+    providers' async paths as tasks on the caller's event loop.
+    """
+
+    def __init__(self, tools, tracker=None, deadline=SEARCH_DEADLINE, min_results=MIN_GOOD_RESULTS, limiters=None):
+        self.tools = list(tools)
+        self.tracker = tracker or _tracker
+        self.deadline = deadline
+        self.min_results = min_results
+        self.limiters = limiters or {}
+
+    def _ranked(self):
+        return sorted(self.tools, key=lambda tool: self.tracker.score(tool.name))
+
+    def _hedge_delay(self, tool):
+        p75 = self.tracker.percentile(tool.name, 75)
+        return min(self.deadline, max(0.2, p75 if p75 is not None else DEFAULT_HEDGE_DELAY))
+
+    def _next_tool(self, waiting, idle):
+        """Pop the best-ranked waiting provider that can start now (or, if ``idle``, the best-ranked one)."""
+        for i, tool in enumerate(waiting):
+            limiter = self.limiters.get(tool.name)
+            if limiter is None or limiter.has_capacity():
+                return waiting.pop(i)
+        return waiting.pop(0) if idle else None
+
+    def _launch(self, waiting, idle, now, start):
+        """Start the next hedge with ``start(tool)``; returns when to start the one after it."""
+        tool = self._next_tool(waiting, idle)
+        if tool is None:
+            # Every remaining provider is busy; look again shortly
+            return now + CAPACITY_RECHECK
+        start(tool)
+        return now + self._hedge_delay(tool)
+
+    @staticmethod
+    def _format(collected, query):
+        if not collected:
+            return f"No results found for: {query}"
+        return format_evidence(dedupe_results(collected), SEARCH_RESULT_MAX_CHARS)
+
+    @staticmethod
+    def _parse(tool, query, result=None, error=None):
+        if error is not None:
+            print(f"Search failed ({tool.name}: {query}): {error}")
+            return []
+        return [] if is_error_result(result) else parse_search_results(result)
+
+    @classmethod
+    def _search(cls, tool, query):
+        try:
+            return cls._parse(tool, query, tool.invoke(query))
+        except Exception as e:
+            return cls._parse(tool, query, error=e)
+
+    @classmethod
+    async def _asearch(cls, tool, query):
+        try:
+            return cls._parse(tool, query, await tool.ainvoke(query))
+        except Exception as e:
+            return cls._parse(tool, query, error=e)
+
+    def run(self, query):
+        waiting = self._ranked()
+        pending = set()
+        collected = []
+        started = time.monotonic()
+        next_launch = started
+        try:
+            while True:
+                now = time.monotonic()
+                if waiting and (now >= next_launch or not pending):
+                    next_launch = self._launch(
+                        waiting, not pending, now, lambda tool: pending.add(_executor.submit(self._search, tool, query))
+                    )
+                remaining = self.deadline - (now - started)
+                if remaining <= 0 or not pending:
+                    break
+                timeout = min(remaining, next_launch - now) if waiting else remaining
+                done, pending = wait(pending, timeout=max(0.0, timeout), return_when=FIRST_COMPLETED)
+                for future in done:
+                    results = future.result()
+                    if len(results) >= self.min_results:
+                        return self._format(results, query)
+                    collected.extend(results)
+                    # Failed or too few results: start the next hedge now rather than at its scheduled time
+                    next_launch = time.monotonic()
+        finally:
+            # Hedges still queued for a worker are no longer needed; running ones finish for the cache
+            for future in pending:
+                future.cancel()
+        return self._format(collected, query)
+
+    async def arun(self, query):
+        waiting = self._ranked()
+        pending = set()
+        collected = []
+        started = time.monotonic()
+        next_launch = started
+        try:
+            while True:
+                now = time.monotonic()
+                if waiting and (now >= next_launch or not pending):
+                    next_launch = self._launch(
+                        waiting, not pending, now, lambda tool: pending.add(asyncio.ensure_future(self._asearch(tool, query)))
+                    )
+                remaining = self.deadline - (now - started)
+                if remaining <= 0 or not pending:
+                    break
+                timeout = min(remaining, next_launch - now) if waiting else remaining
+                done, pending = await asyncio.wait(pending, timeout=max(0.0, timeout), return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    results = task.result()
+                    if len(results) >= self.min_results:
+                        return self._format(results, query)
+                    collected.extend(results)
+                    next_launch = time.monotonic()
+        finally:
+            # Slower calls keep running so their results still reach the search cache
+            for task in pending:
+                _background.add(task)
+                task.add_done_callback(_background.discard)
+        return self._format(collected, query)
+
+
+def hedged_search_tool(tools, tracker=None):
+    """The composite web_search tool the agents use in place of the individual providers."""
+    from langchain_core.tools import Tool
+    from src.agents.tools import TOOL_PROVIDERS
+    from src.utils.rate_limit import get_limiter
+
+    limiters = {tool.name: get_limiter(TOOL_PROVIDERS[tool.name]) for tool in tools if tool.name in TOOL_PROVIDERS}
+    search = HedgedSearch(tools, tracker, limiters=limiters)
+    return Tool(
+        name="web_search",
+        description=(
+            "Searches the web with several search engines at once and returns numbered results "
+            "with title, URL and snippet. Input should be a search query."
+        ),
+        func=search.run,
+        coroutine=search.arun,
+    )
@@ -0,0 +1,213 @@
+import os
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+
+from src.agents.base import DEFAULT_MODE
+from src.agents.control import CancellationToken
+from src.agents.evidence import evidence_for
+from src.agents.registry import COMBINED
+from src.agents.runner import extract_section, extract_combined, refresh_section
+from src.utils.cache import SECTIONS, get_from_cache, is_cacheable, normalize_satellite_name
+
+# Agent runs executing at once across all Streamlit sessions
+DEFAULT_JOB_WORKERS = int(os.getenv("SATELLITE_JOB_WORKERS", "8"))
+# Finished jobs kept around so pages can still pick up their results
+MAX_FINISHED_JOBS = 500
+
+QUEUED, RUNNING, DONE, STOPPED, ERROR, CANCELLED = "queued", "running", "done", "stopped", "error", "cancelled"
+FINISHED_STATES = (DONE, STOPPED, ERROR, CANCELLED)
+
+
+class Job:
+    """One (satellite, section) extraction running on the JobManager's pool.
+
+    ``events`` collects the agent's streaming events (see
+    src.agents.streaming) while it runs; ``result`` is set once the job
+    finishes. A job for the COMBINED section runs the combined agent; its
+    ``result`` and ``from_cache`` are then dicts keyed by section. A
+    ``refresh`` job only re-extracts the missing or stale fields of the
+    cached section (see runner.refresh_section).
+    """
+
+    def __init__(self, satellite_name, section, force_run=False, mode=None, refresh=False):
+        self.id = uuid.uuid4().hex[:12]
+        self.satellite_name = satellite_name
+        self.section = section
+        self.force_run = force_run
+        self.mode = mode
+        self.refresh = refresh
+        self.status = QUEUED
+        self.events = []
+        self.result = None
+        self.from_cache = False
+        self.cancel_token = CancellationToken()
+        # Callers (e.g. browser sessions) that submitted this same job
+        self.subscribers = 1
+        self.submitted_at = time.time()
+        self.started_at = None
+        self.finished_at = None
+
+    @property
+    def finished(self):
+        return self.status in FINISHED_STATES
+
+    @property
+    def elapsed(self):
+        if self.started_at is None:
+            return 0.0
+        return round((self.finished_at or time.time()) - self.started_at, 1)
+
+    def __repr__(self):
+        return f"Job({self.id}, {self.satellite_name!r}, {self.section!r}, {self.status})"
+
+
+class JobManager:
+    """Runs section extractions on a background thread pool.
+
+    ``submit`` returns a job id immediately; callers (e.g. Streamlit pages)
+    poll ``get`` and render the job's events and result. Complete results are
+    saved to the cache by the job itself, so they survive the page that
+    started them.
+
+    Submitting a satellite + section that already has an active job with the
+    same options (force_run, mode, refresh) returns that job's id, so
+    everyone asking for it watches one run. Such a job is
+    only cancelled once every subscriber has cancelled it.
+    """
+
+    def __init__(self, max_workers=None):
+        self._executor = ThreadPoolExecutor(max_workers=max_workers or DEFAULT_JOB_WORKERS, thread_name_prefix="satellite-job")
+        self._jobs = OrderedDict()
+        # (normalized satellite name, section, force_run, mode, refresh) -> active Job
+        self._active = {}
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(satellite_name, section, force_run, mode, refresh):
+        return normalize_satellite_name(satellite_name), section, force_run, mode or DEFAULT_MODE, refresh
+
+    def submit(self, satellite_name, section, force_run=False, share_evidence=False, mode=None, refresh=False):
+        key = self._key(satellite_name, section, force_run, mode, refresh)
+        with self._lock:
+            job = self._active.get(key)
+            if job is not None and not job.finished and not job.cancel_token.cancelled:
+                job.subscribers += 1
+                return job.id
+            job = Job(satellite_name, section, force_run=force_run, mode=mode, refresh=refresh)
+            self._jobs[job.id] = job
+            self._active[key] = job
+            self._prune()
+        self._executor.submit(self._run, job, share_evidence)
+        return job.id
+
+    def submit_all(self, satellite_name, sections, force_run=False, mode=None):
+        """Submit one job per section; the sections share one evidence bundle. Returns {section: job_id}."""
+        sections = list(sections)
+        share_evidence = len(sections) > 1
+        return {
+            section: self.submit(satellite_name, section, force_run=force_run, share_evidence=share_evidence, mode=mode)
+            for section in sections
+        }
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def cancel(self, job_id):
+        with self._lock:
+            job = self._jobs.get(job_id)
+            if job is None or job.finished:
+                return job
+            job.subscribers -= 1
+            if job.subscribers <= 0:
+                job.cancel_token.cancel()
+        return job
+
+    def active_jobs(self):
+        with self._lock:
+            return [job for job in self._jobs.values() if not job.finished]
+
+    def _prune(self):
+        finished = [job_id for job_id, job in self._jobs.items() if job.finished]
+        for job_id in finished[:max(0, len(finished) - MAX_FINISHED_JOBS)]:
+            del self._jobs[job_id]
+
+    def _run(self, job, share_evidence):
+        from src.agents.streaming import AgentEventHandler
+
+        job.started_at = time.time()
+        try:
+            if job.cancel_token.cancelled:
+                job.status = CANCELLED
+                return
+            job.status = RUNNING
+            handler = AgentEventHandler(job.events.append)
+            if job.section == COMBINED:
+                results, from_cache = extract_combined(
+                    job.satellite_name, force_run=job.force_run, evidence=evidence_for(job.satellite_name, refresh=job.force_run),
+                    callbacks=[handler], cancel_token=job.cancel_token, mode=job.mode
+                )
+                job.result, job.from_cache = results, from_cache
+                if all(is_cacheable(result) for result in results.values()):
+                    job.status = DONE
+                elif any(result.get("stopped") for result in results.values()):
+                    job.status = STOPPED
+                else:
+                    job.status = ERROR
+                return
+            if job.refresh:
+                result, from_cache = refresh_section(
+                    job.satellite_name, job.section, callbacks=[handler], cancel_token=job.cancel_token
+                )
+            else:
+                result, from_cache = self._extract(job, handler, share_evidence)
+            job.result, job.from_cache = result, from_cache
+            if is_cacheable(result):
+                job.status = DONE
+            elif isinstance(result, dict) and result.get("stopped"):
+                job.status = STOPPED
+            else:
+                job.status = ERROR
+        except Exception as e:
+            print(f"Error running {job.section} job for {job.satellite_name}: {e}")
+            error = {"error": str(e), "satellite_name": job.satellite_name, "data": None}
+            if job.section == COMBINED:
+                # Combined results are keyed by section, also when the run fails
+                job.result = {section: dict(error) for section in SECTIONS}
+                job.from_cache = {section: False for section in SECTIONS}
+            else:
+                job.result = error
+            job.status = ERROR
+        finally:
+            job.finished_at = time.time()
+            with self._lock:
+                key = self._key(job.satellite_name, job.section, job.force_run, job.mode, job.refresh)
+                if self._active.get(key) is job:
+                    del self._active[key]
+
+    @staticmethod
+    def _extract(job, handler, share_evidence):
+        evidence = None
+        if share_evidence and (job.force_run or not get_from_cache(job.satellite_name, job.section)):
+            evidence = evidence_for(job.satellite_name, refresh=job.force_run)
+        return extract_section(
+            job.satellite_name, job.section, force_run=job.force_run, evidence=evidence,
+            callbacks=[handler], cancel_token=job.cancel_token, mode=job.mode
+        )
+
+
+_manager = None
+_manager_lock = threading.Lock()
+
+
+def get_job_manager():
+    """Return the process-wide JobManager shared by all Streamlit sessions."""
+    global _manager
+    if _manager is None:
+        with _manager_lock:
+            if _manager is None:
+                _manager = JobManager()
+    return _manager
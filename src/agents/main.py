@@ -2,13 +2,10 @@ import os
 import sys
 from dotenv import load_dotenv
 
-# Add parent directory to path for imports
-sys.path.append(os.path.join(os.path.dirname(__file__), '..'))
+# Add project root to path for imports
+sys.path.append(os.path.join(os.path.dirname(__file__), '..', '..'))
 
-from basic_mission_data import BasicMissionData
-from technical_data import TechnicalData
-from launch_data import LaunchData
-from cost_and_other_data import CostAndOtherData
+from src.agents.runner import run_sections, combine_results
 import json
 
 def main():
@@ -20,28 +17,13 @@ def main():
     print("=" * 50)
     
     try:
-        # Initialize all agents
-        print("Initializing agents...")
-        basic_mission = BasicMissionData()
-        technical_data = TechnicalData()
-        launch_data = LaunchData()
-        cost_data = CostAndOtherData()
-        
-        # Extract basic mission data
-        print(f"Extracting basic mission data for {satellite_name}...")
-        basic_result = basic_mission.call(satellite_name)
-        
-        # Extract technical data
-        print(f"Extracting technical data for {satellite_name}...")
-        technical_result = technical_data.call(satellite_name)
-        
-        # Extract launch data
-        print(f"Extracting launch data for {satellite_name}...")
-        launch_result = launch_data.call(satellite_name)
-        
-        # Extract cost and other data
-        print(f"Extracting cost and other data for {satellite_name}...")
-        cost_result = cost_data.call(satellite_name)
+        # Run all section agents concurrently
+        print("Extracting basic mission, technical, launch and cost data in parallel...")
+        results = run_sections(satellite_name)
+        basic_result = results["basic"]
+        technical_result = results["technical"]
+        launch_result = results["launch"]
+        cost_result = results["cost"]
         
         # Display individual results
         print("\nBASIC MISSION DATA RESULTS:")
@@ -99,19 +81,7 @@ def main():
         # Combine results into single JSON
         print("\nCOMBINED RESULTS:")
         print("=" * 50)
-        combined_data = {
-            "satellite_name": satellite_name,
-            "extraction_status": {
-                "basic_mission_data": "success" if "error" not in basic_result else "error",
-                "technical_data": "success" if "error" not in technical_result else "error",
-                "launch_data": "success" if "error" not in launch_result else "error",
-                "cost_and_other_data": "success" if "error" not in cost_result else "error"
-            },
-            "basic_mission_data": basic_result if "error" not in basic_result else {"error": basic_result["error"]},
-            "technical_data": technical_result if "error" not in technical_result else {"error": technical_result["error"]},
-            "launch_data": launch_result if "error" not in launch_result else {"error": launch_result["error"]},
-            "cost_and_other_data": cost_result if "error" not in cost_result else {"error": cost_result["error"]}
-        }
+        combined_data = combine_results(satellite_name, results)
         print("\nCombined JSON Output:")
         print(json.dumps(combined_data, indent=2))
         
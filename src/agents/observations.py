@@ -0,0 +1,192 @@
+"""Post-processing of search observations before they reach the ReAct scratchpad.
+
+Every observation stays in the prompt for the rest of the run, so raw
+search output would make each step slower than the last. The agents' tools
+are wrapped with ``compressed_tool``. While a run is active (see
+``compressing``), each observation is cut down as follows:
+
+- results whose URL was already shown earlier in the run are dropped
+- boilerplate (navigation, cookie banners, "read more" ...) is stripped
+- only sentences that mention a field the agent still has to fill are kept
+- the observation is capped at OBSERVATION_MAX_CHARS
+
+``format_scratchpad`` additionally shortens observations older than the
+last SCRATCHPAD_WINDOW steps to their result titles and URLs; the values
+found in them live on in the agent's "Found:" lines.
+"""
+import contextvars
+import os
+import re
+from contextlib import contextmanager
+
+from src.agents.evidence import dedupe_results, format_evidence
+from src.agents.tools import parse_search_results, normalize_url, is_error_result
+
+OBSERVATION_MAX_CHARS = int(os.getenv("SATELLITE_OBSERVATION_MAX_CHARS", "1500"))
+SNIPPET_MAX_CHARS = 300
+# Observations kept in full in the scratchpad; older ones are shortened
+SCRATCHPAD_WINDOW = int(os.getenv("SATELLITE_SCRATCHPAD_WINDOW", "2"))
+
+# Words from field names and descriptions that say nothing about the field
+_STOPWORDS = {
+    "a", "an", "and", "as", "based", "by", "covered", "each", "eg", "etc", "find", "following", "for", "in",
+    "introduced", "its", "link", "look", "mission", "new", "notable", "of", "official", "on", "one", "or",
+    "purpose", "satellite", "such", "the", "this", "to", "unique", "url", "urls", "used", "value", "values", "with",
+}
+# Words search results use for a field that its name and description do not mention
+FIELD_HINTS = {
+    "altitude": ["km", "orbit", "perigee", "apogee"],
+    "orbital_life_years": ["lifetime", "life", "years"],
+    "number_of_payloads": ["payload", "instrument", "carries"],
+    "launch_success": ["successful", "successfully", "failed", "failure", "anomaly"],
+    "vehicle_reusability": ["reusable", "recovered", "expendable"],
+    "vehicle_reusability_details": ["reusable", "recovered", "booster"],
+    "mission_cost": ["cost", "crore", "million", "billion", "budget", "rs", "inr", "usd"],
+    "spacenext_launch_cost": ["cost", "price", "million", "usd"],
+    "launch_date": ["launched", "lifted", "liftoff"],
+    "actual_launch_mass": ["mass", "weight", "kg", "weighing"],
+    "max_launch_mass_leo": ["payload", "capacity", "kg", "leo"],
+}
+
+_BOILERPLATE = re.compile(
+    r"\b(?:skip to (main )?content|jump to (navigation|search)|accept (all )?cookies?|we use cookies[^.]*\.?|"
+    r"cookie (policy|settings)|privacy policy|all rights reserved|sign (in|up)|log ?in|subscribe( now)?|"
+    r"read more|click here|share (this|on) \w+|advertisement|menu\b|home\s*[»>|/])",
+    re.I,
+)
+_SENTENCE_END = re.compile(r"(?<=[.!?;])\s+")
+_WORD = re.compile(r"[a-z0-9]+")
+
+_run_state = contextvars.ContextVar("observation_run_state", default=None)
+
+
+def _stem(word):
+    return word[:-1] if len(word) > 3 and word.endswith("s") else word
+
+
+def field_keywords(output_model):
+    """Field name -> words that mark a search snippet as relevant to it."""
+    keywords = {}
+    for name, field in output_model.model_fields.items():
+        if "source" in name:
+            continue
+        words = _WORD.findall(f"{name.replace('_', ' ')} {field.description or ''}".lower())
+        words += FIELD_HINTS.get(name, [])
+        keywords[name] = {_stem(word) for word in words if word not in _STOPWORDS and len(word) > 1}
+    return keywords
+
+
+def strip_boilerplate(text):
+    text = _BOILERPLATE.sub(" ", text)
+    text = re.sub(r"\.{3,}|…", " ", text)
+    return " ".join(text.split())
+
+
+class ObservationCompressor:
+    """Per-run state of the observation post-processing.
+
+    ``open_fields`` returns the fields still to be filled (e.g.
+    RunControlHandler.open_fields); results are judged relevant against
+    those fields only.
+    """
+
+    def __init__(self, output_model, open_fields=None, max_chars=OBSERVATION_MAX_CHARS):
+        self.keywords = field_keywords(output_model)
+        self.open_fields = open_fields or (lambda: list(self.keywords))
+        self.max_chars = max_chars
+        self.seen_urls = set()
+
+    def _relevant(self, text, keywords):
+        """The sentences of text that mention one of the keywords, joined back together."""
+        sentences = [
+            sentence for sentence in _SENTENCE_END.split(text)
+            if keywords.intersection(_stem(word) for word in _WORD.findall(sentence.lower()))
+        ]
+        return " ".join(sentences)[:SNIPPET_MAX_CHARS].strip()
+
+    def compress(self, observation):
+        if is_error_result(observation):
+            return observation
+        items = parse_search_results(observation)
+        if not items or not any(item["url"] for item in items):
+            # Not a result list (e.g. "No results found for: ..."); only cap it
+            return str(observation)[:self.max_chars]
+        fields = [name for name in self.open_fields() if name in self.keywords] or list(self.keywords)
+        keywords = set().union(*(self.keywords[name] for name in fields))
+        kept, repeated = [], 0
+        for item in dedupe_results(items):
+            url = normalize_url(item["url"]) if item["url"] else ""
+            if url and url in self.seen_urls:
+                repeated += 1
+                continue
+            title = strip_boilerplate(item["title"])
+            snippet = self._relevant(strip_boilerplate(item["snippet"]), keywords)
+            if not snippet:
+                continue
+            if url:
+                self.seen_urls.add(url)
+            kept.append({"title": title, "url": item["url"], "snippet": snippet})
+        if kept:
+            text = format_evidence(kept, self.max_chars)
+        else:
+            text = f"No new results about {', '.join(fields)}."
+        if repeated:
+            text += f"\n({repeated} results already shown earlier in this run were left out.)"
+        return text
+
+
+@contextmanager
+def compressing(compressor):
+    """Compress the observations of compressed tools called inside this block (and tasks it starts)."""
+    token = _run_state.set(compressor)
+    try:
+        yield compressor
+    finally:
+        _run_state.reset(token)
+
+
+def _compress(result):
+    compressor = _run_state.get()
+    if compressor is None:
+        return result
+    try:
+        return compressor.compress(result)
+    except Exception as e:
+        print(f"Could not compress observation: {e}")
+        return result
+
+
+def compressed_tool(tool):
+    """Wrap a tool so its output is compressed by the run's ObservationCompressor, if any."""
+    from langchain_core.tools import Tool
+
+    inner_config = {"callbacks": []}
+
+    def run(query):
+        return _compress(tool.invoke(query, config=inner_config))
+
+    async def arun(query):
+        return _compress(await tool.ainvoke(query, config=inner_config))
+
+    return Tool(name=tool.name, description=tool.description, func=run, coroutine=arun)
+
+
+def _shorten(observation):
+    """Titles and URLs of an older observation, so the agent can still cite them."""
+    observation = str(observation)
+    lines = [line for line in observation.splitlines() if re.match(r"\[\d+\] ", line)]
+    if not lines:
+        return observation if len(observation) <= SNIPPET_MAX_CHARS else "(shortened; see the Found lines above)"
+    return "(snippets shortened; see the Found lines above)\n" + "\n".join(lines)
+
+
+def format_scratchpad(intermediate_steps, window=SCRATCHPAD_WINDOW):
+    """format_log_to_str, with observations older than the last ``window`` steps shortened."""
+    thoughts = ""
+    older = len(intermediate_steps) - window
+    for i, (action, observation) in enumerate(intermediate_steps):
+        if i < older:
+            observation = _shorten(observation)
+        thoughts += action.log
+        thoughts += f"\nObservation: {observation}\nThought: "
+    return thoughts
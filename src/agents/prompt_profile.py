@@ -0,0 +1,147 @@
+"""Prompt-token profile of the section agents.
+
+Usage:
+    python -m src.agents.prompt_profile [satellite_name] [--section basic ...] [--run]
+
+Without --run, prints the estimated tokens of each agent's ReAct prompt by
+component: instructions, tools, format instructions and evidence. With
+--run, also runs the agents and prints every LLM step, adding the
+scratchpad (the Thought/Action/Observation history, which grows each step)
+and the input tokens Gemini reports for the step.
+
+Component sizes are estimated at CHARS_PER_TOKEN characters per token so
+profiling needs no extra API calls.
+"""
+import argparse
+import string
+import threading
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from src.agents.evidence import NO_EVIDENCE
+from src.agents.tools import render_tools
+
+CHARS_PER_TOKEN = 4
+
+COMPONENTS = ("instructions", "tools", "format_instructions", "evidence", "scratchpad")
+# Table columns, wide enough for the longest header plus a space
+COLUMNS = COMPONENTS + ("total", "reported")
+COLUMN_WIDTH = max(len(name) for name in COLUMNS) + 2
+
+
+def estimate_tokens(text):
+    return -(-len(text) // CHARS_PER_TOKEN)
+
+
+def prompt_components(agent, satellite_name, evidence=None):
+    """Estimated tokens of an agent's ReAct prompt before its first step, by component."""
+    from src.agents.base import load_prompt
+
+    template = load_prompt(agent.prompt_file)
+    tools = render_tools(agent.tools)
+    tool_names = ", ".join(tool.name for tool in agent.tools)
+    placeholders = [field for _, field, _, _ in string.Formatter().parse(template) if field]
+    # Everything in the template except the filled-in variables is instructions
+    instructions = template.format(
+        satellite_name=satellite_name, tools="", tool_names="", format_instructions="", evidence="", agent_scratchpad=""
+    )
+    fill = {
+        "tools": tools,
+        "tool_names": tool_names,
+        "format_instructions": agent.get_format_instructions(),
+        "evidence": evidence or NO_EVIDENCE,
+    }
+    components = {
+        "instructions": estimate_tokens(instructions),
+        "tools": sum(estimate_tokens(fill[name]) for name in placeholders if name in ("tools", "tool_names")),
+        "format_instructions": sum(estimate_tokens(fill["format_instructions"]) for name in placeholders if name == "format_instructions"),
+        "evidence": sum(estimate_tokens(fill["evidence"]) for name in placeholders if name == "evidence"),
+        "scratchpad": 0,
+    }
+    components["total"] = estimate_tokens(template.format(satellite_name=satellite_name, agent_scratchpad="", **fill))
+    return components
+
+
+class PromptProfiler(BaseCallbackHandler):
+    """Records the prompt size of every LLM call in a run.
+
+    ``base`` is the run's ``prompt_components``; since the scratchpad comes
+    last in the ReAct prompts, whatever a step's prompt holds beyond the base
+    prompt is scratchpad. ``steps`` holds one dict per LLM call.
+    """
+
+    def __init__(self, base):
+        self.base = base
+        self.steps = []
+        self._by_run = {}
+        self._lock = threading.Lock()
+
+    def _start(self, run_id, text):
+        total = estimate_tokens(text)
+        step = dict(self.base)
+        step["scratchpad"] = max(0, total - self.base["total"])
+        step["total"] = total
+        step["input_tokens"] = None
+        with self._lock:
+            step["step"] = len(self.steps) + 1
+            self.steps.append(step)
+            self._by_run[run_id] = step
+
+    def on_llm_start(self, serialized, prompts, *, run_id, **kwargs):
+        self._start(run_id, "".join(prompts))
+
+    def on_chat_model_start(self, serialized, messages, *, run_id, **kwargs):
+        self._start(run_id, "".join(str(message.content) for message in messages[0]))
+
+    def on_llm_end(self, response, *, run_id, **kwargs):
+        with self._lock:
+            step = self._by_run.pop(run_id, None)
+        if step is None:
+            return
+        try:
+            step["input_tokens"] = response.generations[0][0].message.usage_metadata["input_tokens"]
+        except (AttributeError, IndexError, KeyError, TypeError):
+            pass
+
+    def summary(self):
+        """Prompt tokens of the whole run, by component."""
+        totals = {name: sum(step[name] for step in self.steps) for name in COMPONENTS + ("total",)}
+        reported = [step["input_tokens"] for step in self.steps if step["input_tokens"] is not None]
+        totals["input_tokens"] = sum(reported) if reported else None
+        totals["steps"] = len(self.steps)
+        return totals
+
+
+def _row(label, counts):
+    cells = "".join(f"{counts.get(name, 0):>{COLUMN_WIDTH}}" for name in COMPONENTS + ("total",))
+    reported = counts.get("input_tokens")
+    return f"{label:<12}{cells}{reported if reported is not None else '-':>{COLUMN_WIDTH}}"
+
+
+def main():
+    from src.agents.registry import AGENTS, get_agent
+
+    parser = argparse.ArgumentParser(description="Profile the prompt tokens of the section agents.")
+    parser.add_argument("satellite_name", nargs="?", default="Cartosat-3")
+    parser.add_argument("--section", action="append", choices=list(AGENTS), help="Section to profile (repeatable; default: all)")
+    parser.add_argument("--run", action="store_true", help="Run the agents and profile every step")
+    args = parser.parse_args()
+
+    header = f"{'':<12}" + "".join(f"{name:>{COLUMN_WIDTH}}" for name in COLUMNS)
+    for section in args.section or list(AGENTS):
+        agent = get_agent(section)
+        base = prompt_components(agent, args.satellite_name)
+        print(f"\n{section} ({args.satellite_name}), estimated prompt tokens")
+        print(header)
+        print(_row("first step", base))
+        if not args.run:
+            continue
+        profiler = PromptProfiler(base)
+        agent.call(args.satellite_name, callbacks=[profiler])
+        for step in profiler.steps:
+            print(_row(f"step {step['step']}", step))
+        print(_row("run total", profiler.summary()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,49 @@
+import threading
+
+from src.agents.basic_mission_data import BasicMissionData
+from src.agents.technical_data import TechnicalData
+from src.agents.launch_data import LaunchData
+from src.agents.cost_and_other_data import CostAndOtherData
+from src.agents.combined_data import CombinedData
+
+# Section name (as used by the cache) -> agent class
+SECTION_AGENTS = {
+    "basic": BasicMissionData,
+    "technical": TechnicalData,
+    "launch": LaunchData,
+    "cost": CostAndOtherData,
+}
+
+# Fills all four sections in one run (see src.agents.combined_data)
+COMBINED = "combined"
+AGENTS = {**SECTION_AGENTS, COMBINED: CombinedData}
+
+_agents = {}
+_lock = threading.Lock()
+
+
+def get_agent(section, refresh=False):
+    """Return the process-wide agent for a section (or COMBINED), building it on first use.
+
+    The agent (Gemini client, search tools, prompt and AgentExecutor) is
+    built once per process and shared by every caller, thread and Streamlit
+    session. ``refresh`` returns the variant that bypasses the LLM and
+    search caches, for forced runs and field refreshes.
+    """
+    key = (section, refresh)
+    agent = _agents.get(key)
+    if agent is None:
+        with _lock:
+            agent = _agents.get(key)
+            if agent is None:
+                agent = AGENTS[section](refresh=refresh)
+                agent.get_format_instructions()
+                agent.initialize_agent()
+                _agents[key] = agent
+    return agent
+
+
+def reset_agents():
+    """Drop all cached agents (e.g. after changing API keys)."""
+    with _lock:
+        _agents.clear()
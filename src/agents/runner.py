@@ -0,0 +1,345 @@
+import asyncio
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from src.agents.base import DEFAULT_MODE
+from src.agents.registry import SECTION_AGENTS, COMBINED, get_agent
+from src.agents.evidence import gather_evidence, agather_evidence
+from src.utils.cache import (
+    SECTIONS, section_ttl, get_from_cache, save_to_cache, get_field_metadata, save_field_metadata,
+    normalize_satellite_name, is_cacheable
+)
+from src.utils.helpers import is_missing_value
+from src.utils.singleflight import SingleFlight
+
+# Section name -> key used in the combined JSON output
+RESULT_KEYS = {
+    "basic": "basic_mission_data",
+    "technical": "technical_data",
+    "launch": "launch_data",
+    "cost": "cost_and_other_data",
+}
+
+# Upper bound on agent runs in flight at once for the async API
+DEFAULT_MAX_CONCURRENCY = int(os.getenv("SATELLITE_MAX_CONCURRENCY", "8"))
+
+# Concurrent runs of the same satellite + section share one agent run
+_inflight = SingleFlight()
+
+# Background refreshes of stale cached sections running at once
+REVALIDATE_WORKERS = int(os.getenv("SATELLITE_REVALIDATE_WORKERS", "2"))
+_revalidate_executor = ThreadPoolExecutor(max_workers=REVALIDATE_WORKERS, thread_name_prefix="cache-revalidate")
+_revalidating = set()
+_revalidating_lock = threading.Lock()
+
+
+def _error_result(satellite_name, section, error):
+    print(f"Error running {section} agent for {satellite_name}: {error}")
+    return {
+        "error": str(error),
+        "satellite_name": satellite_name,
+        "data": None
+    }
+
+
+def _flight_key(satellite_name, section):
+    return normalize_satellite_name(satellite_name), section
+
+
+def _cancelled_by_other(result, cancel_token):
+    """True if a shared run was cancelled by another caller rather than by us."""
+    return (isinstance(result, dict) and result.get("stopped") == "cancelled"
+            and not (cancel_token is not None and cancel_token.cancelled))
+
+
+def _run_shared(satellite_name, section, evidence=None, agent=None, callbacks=None, cancel_token=None, mode=None,
+                refresh=False):
+    """Run one section agent, joining a run of the same satellite, section and mode already in flight.
+
+    Returns (result, shared). ``callbacks`` only see the run if this call is
+    the one executing it. A shared run cancelled by another caller is
+    retried instead of handing back their partial result. A ``refresh`` run
+    bypasses the LLM and search caches and only joins other refresh runs.
+    """
+    key = _flight_key(satellite_name, section) + (mode or DEFAULT_MODE,) + (("force",) if refresh else ())
+
+    def run():
+        try:
+            return (agent or get_agent(section, refresh)).call(
+                satellite_name, evidence=evidence, callbacks=callbacks, cancel_token=cancel_token, mode=mode
+            )
+        except Exception as e:
+            return _error_result(satellite_name, section, e)
+
+    while True:
+        result, shared = _inflight.do(key, run)
+        if not (shared and _cancelled_by_other(result, cancel_token)):
+            return result, shared
+
+
+def _save_result(satellite_name, section, result, fields=None):
+    """Cache a section result and record when (and from where) each of ``fields`` was last extracted."""
+    save_to_cache(satellite_name, section, result)
+    _record_fields(satellite_name, section, result, fields)
+
+
+def _record_fields(satellite_name, section, result, fields=None):
+    agent_class = SECTION_AGENTS[section]
+    metadata = get_field_metadata(satellite_name, section)
+    now = time.time()
+    for name in fields or agent_class.value_fields():
+        source = agent_class.source_field(name)
+        metadata[name] = {"value": result.get(name), "source": result.get(source) if source else None, "updated_at": now}
+    save_field_metadata(satellite_name, section, metadata)
+
+
+def run_section(satellite_name, section, evidence=None, agent=None, callbacks=None, cancel_token=None, mode=None):
+    return _run_shared(satellite_name, section, evidence, agent, callbacks, cancel_token, mode)[0]
+
+
+def extract_section(satellite_name, section, force_run=False, agent=None, evidence=None, callbacks=None,
+                    cancel_token=None, mode=None):
+    """Return (result, from_cache) for one section, running the agent only on a cache miss.
+
+    Successful results are saved to the cache; errors and stopped runs are
+    not, so they are retried on the next request. ``agent`` overrides the
+    shared registry agent. Concurrent requests for an uncached section wait
+    on one agent run, and only that run's caller writes the cache. A forced
+    run bypasses the LLM and search caches too.
+    ``mode`` selects the extraction mode (see src.agents.base.EXTRACTION_MODES).
+
+    A cached section past its TTL is still returned right away, and its
+    stale fields are refreshed in the background (stale-while-revalidate).
+    """
+    if not force_run:
+        cached = cached_section(satellite_name, section)
+        if cached:
+            return cached, True
+    result, shared = _run_shared(satellite_name, section, evidence, agent, callbacks, cancel_token, mode, force_run)
+    if not shared and is_cacheable(result):
+        _save_result(satellite_name, section, result)
+    return result, False
+
+
+def stale_fields(satellite_name, section, metadata=None):
+    """Value fields of a cached section extracted longer ago than the section's TTL.
+
+    A section cached before field metadata was recorded has an unknown
+    age and counts as fresh (see cached_section).
+    """
+    if metadata is None:
+        metadata = get_field_metadata(satellite_name, section)
+    ttl = section_ttl(section)
+    if not metadata or not ttl:
+        return []
+    now = time.time()
+    return [
+        name for name in SECTION_AGENTS[section].value_fields()
+        if now - metadata.get(name, {}).get("updated_at", 0) > ttl
+    ]
+
+
+def fields_to_refresh(satellite_name, section, cached=None):
+    """Value fields of a cached section that are empty or past the section's TTL."""
+    cached = cached or get_from_cache(satellite_name, section) or {}
+    stale = stale_fields(satellite_name, section)
+    return [
+        name for name in SECTION_AGENTS[section].value_fields()
+        if is_missing_value(cached.get(name)) or name in stale
+    ]
+
+
+def cached_section(satellite_name, section):
+    """The cached result of a section, or None; a stale one is revalidated in the background.
+
+    A section cached before field metadata existed (e.g. migrated from
+    satellite_cache.json) gets its metadata recorded now, so its TTL starts
+    counting instead of every field being re-extracted on first view.
+    """
+    cached = get_from_cache(satellite_name, section)
+    if not cached:
+        return cached
+    metadata = get_field_metadata(satellite_name, section)
+    if not metadata:
+        _record_fields(satellite_name, section, cached)
+    elif stale_fields(satellite_name, section, metadata):
+        revalidate(satellite_name, section)
+    return cached
+
+
+def revalidate(satellite_name, section):
+    """Refresh the stale fields of a cached section in the background.
+
+    At most one revalidation per satellite and section is queued at a time,
+    and it joins a refresh of the same fields already in flight. Returns
+    False if one was already queued.
+    """
+    key = _flight_key(satellite_name, section)
+    with _revalidating_lock:
+        if key in _revalidating:
+            return False
+        _revalidating.add(key)
+
+    def run():
+        try:
+            fields = stale_fields(satellite_name, section)
+            if fields:
+                refresh_section(satellite_name, section, fields=fields)
+        except Exception as e:
+            print(f"Error revalidating {section} for {satellite_name}: {e}")
+        finally:
+            with _revalidating_lock:
+                _revalidating.discard(key)
+
+    _revalidate_executor.submit(run)
+    return True
+
+
+def refresh_section(satellite_name, section, fields=None, evidence=None, callbacks=None, cancel_token=None):
+    """Re-extract only the missing or stale fields of a cached section; returns (result, from_cache).
+
+    The good cached fields are kept and the agent searches only for the
+    rest, so the cost of a refresh follows the number of fields refreshed.
+    ``fields`` overrides which fields are refreshed. Without a cached
+    section this is a normal extraction.
+    """
+    cached = get_from_cache(satellite_name, section)
+    if not cached:
+        return extract_section(
+            satellite_name, section, force_run=True, evidence=evidence, callbacks=callbacks, cancel_token=cancel_token
+        )
+    fields = list(fields) if fields else fields_to_refresh(satellite_name, section, cached)
+    if not fields:
+        return cached, True
+
+    def run():
+        try:
+            return get_agent(section, refresh=True).refresh(
+                satellite_name, cached, fields, evidence=evidence, callbacks=callbacks, cancel_token=cancel_token
+            )
+        except Exception as e:
+            return _error_result(satellite_name, section, e)
+
+    result, shared = _inflight.do(_flight_key(satellite_name, section) + ("refresh",) + tuple(sorted(fields)), run)
+    if not shared and is_cacheable(result):
+        _save_result(satellite_name, section, result, fields)
+    return result, False
+
+
+def extract_combined(satellite_name, sections=SECTIONS, force_run=False, evidence=None, callbacks=None,
+                     cancel_token=None, mode=None):
+    """Extract several sections with one combined agent run instead of one run per section.
+
+    Returns ({section: result}, {section: from_cache}). Cached sections are
+    returned as they are; the combined result is split per section and each
+    missing section is saved to the cache like a normal section result.
+    """
+    sections = list(sections)
+    results = {}
+    for section in sections:
+        cached = None if force_run else cached_section(satellite_name, section)
+        if cached:
+            results[section] = cached
+    from_cache = {section: section in results for section in sections}
+    missing = [section for section in sections if section not in results]
+    if not missing:
+        return results, from_cache
+    agent = get_agent(COMBINED, force_run)
+    combined, shared = _run_shared(satellite_name, COMBINED, evidence, agent, callbacks, cancel_token, mode, force_run)
+    split = agent.split_result(combined)
+    for section in missing:
+        results[section] = split[section]
+        if not shared and is_cacheable(split[section]):
+            _save_result(satellite_name, section, split[section])
+    return results, from_cache
+
+
+def run_sections(satellite_name, sections=SECTIONS, max_workers=None, share_evidence=True, mode=None):
+    """Run the given section agents in parallel and return {section: result}.
+
+    With share_evidence, one evidence-gathering pass runs first and its
+    bundle is handed to every section, so agents only search for what it
+    does not cover.
+    """
+    sections = list(sections)
+    if not sections:
+        return {}
+    evidence = gather_evidence(satellite_name) if share_evidence and len(sections) > 1 else None
+    with ThreadPoolExecutor(max_workers=max_workers or len(sections)) as executor:
+        futures = {section: executor.submit(run_section, satellite_name, section, evidence, mode=mode) for section in sections}
+        return {section: future.result() for section, future in futures.items()}
+
+
+def combine_results(satellite_name, results):
+    """Build the combined JSON document for one satellite from per-section results."""
+    combined_data = {
+        "satellite_name": satellite_name,
+        "extraction_status": {
+            RESULT_KEYS[section]: "success" if "error" not in results[section] else "error"
+            for section in SECTIONS
+        },
+    }
+    for section in SECTIONS:
+        result = results[section]
+        combined_data[RESULT_KEYS[section]] = result if "error" not in result else {"error": result["error"]}
+    return combined_data
+
+
+def extract_all_sections(satellite_name, max_workers=None, mode=None):
+    """Extract every section for a satellite concurrently and return the combined JSON."""
+    return combine_results(satellite_name, run_sections(satellite_name, max_workers=max_workers, mode=mode))
+
+
+async def arun_jobs(jobs, max_concurrency=None, share_evidence=True, mode=None):
+    """Run (satellite_name, section) jobs on the current event loop.
+
+    At most ``max_concurrency`` agent runs are in flight at once; one agent
+    instance per section (from the registry) is shared by all jobs. With share_evidence, jobs for
+    a satellite with several sections share one evidence bundle. Complete
+    results are saved to the cache. Results are returned in job order.
+    """
+    jobs = list(jobs)
+    semaphore = asyncio.Semaphore(max_concurrency or DEFAULT_MAX_CONCURRENCY)
+    evidence_tasks = {}
+    section_counts = {}
+    for satellite_name, _ in jobs:
+        key = normalize_satellite_name(satellite_name)
+        section_counts[key] = section_counts.get(key, 0) + 1
+
+    async def get_evidence(satellite_name):
+        key = normalize_satellite_name(satellite_name)
+        if not share_evidence or section_counts[key] < 2:
+            return None
+        if key not in evidence_tasks:
+            evidence_tasks[key] = asyncio.ensure_future(agather_evidence(satellite_name))
+        return await evidence_tasks[key]
+
+    async def run(satellite_name, section):
+        evidence = await get_evidence(satellite_name)
+        async def acall():
+            async with semaphore:
+                try:
+                    return await get_agent(section).acall(satellite_name, evidence=evidence, mode=mode)
+                except Exception as e:
+                    return _error_result(satellite_name, section, e)
+
+        # Duplicate jobs, and runs already in flight elsewhere in the process, share one agent run
+        result, shared = await _inflight.ado(_flight_key(satellite_name, section) + (mode or DEFAULT_MODE,), acall)
+        # As in extract_section, the caller that ran the agent saves its result (off the loop)
+        if not shared and is_cacheable(result):
+            await asyncio.get_running_loop().run_in_executor(None, _save_result, satellite_name, section, result)
+        return result
+
+    return await asyncio.gather(*(run(satellite_name, section) for satellite_name, section in jobs))
+
+
+async def arun_sections(satellite_name, sections=SECTIONS, max_concurrency=None, mode=None):
+    sections = list(sections)
+    results = await arun_jobs([(satellite_name, section) for section in sections], max_concurrency, mode=mode)
+    return dict(zip(sections, results))
+
+
+async def aextract_all_sections(satellite_name, max_concurrency=None, mode=None):
+    return combine_results(satellite_name, await arun_sections(satellite_name, max_concurrency=max_concurrency, mode=mode))
@@ -0,0 +1,63 @@
+import threading
+
+import requests
+from requests.adapters import HTTPAdapter
+from langchain_community.utilities import GoogleSerperAPIWrapper
+from langchain_community.utilities.tavily_search import TavilySearchAPIWrapper, TAVILY_API_URL
+
+_http_session = None
+_lock = threading.Lock()
+
+
+def get_http_session():
+    """Process-wide requests.Session so search calls reuse pooled keep-alive connections."""
+    global _http_session
+    if _http_session is None:
+        with _lock:
+            if _http_session is None:
+                session = requests.Session()
+                adapter = HTTPAdapter(pool_connections=4, pool_maxsize=32)
+                session.mount("https://", adapter)
+                session.mount("http://", adapter)
+                _http_session = session
+    return _http_session
+
+
+class PooledSerperAPIWrapper(GoogleSerperAPIWrapper):
+    """GoogleSerperAPIWrapper that sends requests through the shared session."""
+
+    def _google_serper_api_results(self, search_term, search_type="search", **kwargs):
+        headers = {
+            "X-API-KEY": self.serper_api_key or "",
+            "Content-Type": "application/json",
+        }
+        params = {
+            "q": search_term,
+            **{key: value for key, value in kwargs.items() if value is not None},
+        }
+        response = get_http_session().post(
+            f"https://google.serper.dev/{search_type}", headers=headers, params=params
+        )
+        response.raise_for_status()
+        return response.json()
+
+
+class PooledTavilySearchAPIWrapper(TavilySearchAPIWrapper):
+    """TavilySearchAPIWrapper that sends requests through the shared session."""
+
+    def raw_results(self, query, max_results=5, search_depth="advanced", include_domains=[], exclude_domains=[],
+                    include_answer=False, include_raw_content=False, include_images=False):
+        params = {
+            "api_key": self.tavily_api_key.get_secret_value(),
+            "query": query,
+            "max_results": max_results,
+            "search_depth": search_depth,
+            "include_domains": include_domains,
+            "exclude_domains": exclude_domains,
+            "include_answer": include_answer,
+            "include_raw_content": include_raw_content,
+            "include_images": include_images,
+        }
+        response = get_http_session().post(f"{TAVILY_API_URL}/search", json=params)
+        response.raise_for_status()
+        return response.json()
@@ -0,0 +1,173 @@
+import re
+import time
+
+from langchain_core.callbacks import BaseCallbackHandler
+
+from src.agents.control import AgentStopped, FIELD_TOOL_BUDGET
+from src.utils.helpers import is_missing_value
+
+# Observations are shortened to this many characters when rendered for display
+DISPLAY_OBSERVATION_CHARS = 1500
+
+# Lines the prompts ask the agent to write in its Thoughts
+_FOUND = re.compile(r"^\s*Found:\s*`?(\w+)`?\s*[=:]\s*(.+?)\s*$", re.M)
+_SEARCHING = re.compile(r"^\s*Searching for:\s*(.+?)\s*$", re.M)
+
+
+def split_thought(log):
+    """Return the Thought text of a ReAct step, i.e. everything before 'Action:'."""
+    thought = log.split("Action:")[0].split("Final Answer:")[0]
+    return thought.replace("Thought:", "").strip()
+
+
+class AgentEventHandler(BaseCallbackHandler):
+    """Callback handler that turns ReAct steps into event dicts passed to ``emit``.
+
+    Event types: "action" (thought, tool, tool_input), "observation" (output),
+    "tool_error" (error) and "finish" (thought, output). Each event carries
+    the seconds elapsed since the handler was created.
+    """
+
+    def __init__(self, emit):
+        self.emit = emit
+        self.started = time.time()
+
+    def _emit(self, event):
+        event["elapsed"] = round(time.time() - self.started, 1)
+        self.emit(event)
+
+    def on_agent_action(self, action, **kwargs):
+        self._emit({
+            "type": "action",
+            "thought": split_thought(action.log),
+            "tool": action.tool,
+            "tool_input": action.tool_input,
+        })
+
+    def on_tool_end(self, output, **kwargs):
+        self._emit({"type": "observation", "output": str(getattr(output, "content", output))})
+
+    def on_tool_error(self, error, **kwargs):
+        self._emit({"type": "tool_error", "error": str(error)})
+
+    def on_agent_finish(self, finish, **kwargs):
+        self._emit({
+            "type": "finish",
+            "thought": split_thought(finish.log),
+            "output": finish.return_values.get("output", ""),
+        })
+
+
+class RunControlHandler(BaseCallbackHandler):
+    """Enforces cancellation, a RunBudget and per-field tool budgets from inside the ReAct loop.
+
+    Checks run before every LLM call (one per ReAct iteration) and before
+    every tool call, and raise AgentStopped, which LangChain propagates out
+    of the executor because ``raise_error`` is set. The handler also keeps
+    the transcript so the caller can salvage partial fields.
+
+    With ``fields``, it also tracks which of them the agent has filled: the
+    prompts ask for a ``Found: <field> = <value>`` line per answered field
+    and a ``Searching for: <field>, ...`` line before each tool call. Every
+    tool call counts against the fields it is for (all open fields if none
+    are named). A field whose budget is spent is given up. Once no field is
+    left open the run stops: with reason "complete" if every field was
+    reported on a Found line, else with "field_budget", so the caller
+    salvages what it can from the transcript and does not cache the result
+    as complete.
+    """
+
+    raise_error = True
+    run_inline = True
+
+    def __init__(self, cancel_token=None, budget=None, fields=None, field_budgets=None):
+        self.cancel_token = cancel_token
+        self.budget = budget
+        self.started = time.time()
+        self.iterations = 0
+        self.transcript = []
+        self.fields = list(fields or [])
+        self.field_budgets = field_budgets or {}
+        self.values = {}
+        self.resolved = set()
+        self.tool_calls = {}
+
+    def check(self, count_iterations=False):
+        if self.cancel_token is not None and self.cancel_token.cancelled:
+            raise AgentStopped("cancelled")
+        if self.budget is None:
+            return
+        if self.budget.max_seconds and time.time() - self.started > self.budget.max_seconds:
+            raise AgentStopped("timeout")
+        if count_iterations and self.budget.max_iterations and self.iterations >= self.budget.max_iterations:
+            raise AgentStopped("max_iterations")
+
+    def open_fields(self):
+        """Tracked fields that are neither found nor out of tool budget."""
+        return [
+            field for field in self.fields
+            if field not in self.resolved
+            and self.tool_calls.get(field, 0) < self.field_budgets.get(field, FIELD_TOOL_BUDGET)
+        ]
+
+    def exhausted_fields(self):
+        """Tracked fields given up because their tool budget ran out before a Found line."""
+        return [
+            field for field in self.fields
+            if field not in self.resolved
+            and self.tool_calls.get(field, 0) >= self.field_budgets.get(field, FIELD_TOOL_BUDGET)
+        ]
+
+    def _record(self, log):
+        for field, value in _FOUND.findall(log):
+            value = value.strip().strip('"').strip()
+            self.values[field] = None if is_missing_value(value) else value
+            self.resolved.add(field)
+        targets = []
+        for line in _SEARCHING.findall(log):
+            targets += [name.strip(" `'\"") for name in line.split(",")]
+        return targets
+
+    def on_llm_start(self, serialized, prompts, **kwargs):
+        self.check(count_iterations=True)
+
+    def on_chat_model_start(self, serialized, messages, **kwargs):
+        self.check(count_iterations=True)
+
+    def on_agent_action(self, action, **kwargs):
+        self.iterations += 1
+        self.transcript.append(action.log)
+        targets = self._record(action.log)
+        self.check()
+        if not self.fields:
+            return
+        open_fields = self.open_fields()
+        if not open_fields:
+            raise AgentStopped("field_budget" if self.exhausted_fields() else "complete")
+        for field in [field for field in targets if field in open_fields] or open_fields:
+            self.tool_calls[field] = self.tool_calls.get(field, 0) + 1
+
+    def on_tool_start(self, serialized, input_str, **kwargs):
+        self.check()
+
+    def on_tool_end(self, output, **kwargs):
+        self.transcript.append(f"Observation: {getattr(output, 'content', output)}")
+
+
+def format_event(event, max_chars=DISPLAY_OBSERVATION_CHARS):
+    """Render an agent event as Thought/Action/Observation markdown text."""
+    if event["type"] == "action":
+        return (
+            f"**Thought:** {event['thought']}\n\n"
+            f"**Action:** `{event['tool']}` — {event['tool_input']}"
+        )
+    if event["type"] == "observation":
+        output = event["output"]
+        if len(output) > max_chars:
+            output = output[:max_chars] + " …"
+        return f"**Observation** ({event['elapsed']}s):\n\n{output}"
+    if event["type"] == "tool_error":
+        return f"**Tool error:** {event['error']}"
+    if event["type"] == "finish":
+        return f"**Thought:** {event['thought']}\n\n**Final Answer** ({event['elapsed']}s)"
+    return str(event)
@@ -0,0 +1,205 @@
+import ast
+import os
+import re
+import threading
+
+from src.utils.ttl_store import TTLStore, hash_key
+
+SEARCH_CACHE_DB = os.path.join(os.path.dirname(__file__), '../../search_cache.db')
+SEARCH_CACHE_TTL = int(os.getenv("SATELLITE_SEARCH_CACHE_TTL", str(7 * 24 * 3600)))
+SEARCH_CACHE_MAX_ENTRIES = int(os.getenv("SATELLITE_SEARCH_CACHE_MAX_ENTRIES", "20000"))
+SEARCH_CACHE_ENABLED = os.getenv("SATELLITE_SEARCH_CACHE", "1") != "0"
+# Give agents one hedged web_search tool instead of the individual providers
+HEDGED_SEARCH_ENABLED = os.getenv("SATELLITE_HEDGED_SEARCH", "1") != "0"
+
+# DuckDuckGoSearchResults joins results as "snippet: ..., title: ..., link: ..."
+_DDG_RESULT = re.compile(r"snippet: (.*?), title: (.*?), link: (\S+?)(?=, snippet: |$)", re.S)
+# Numbered results as rendered by evidence.format_evidence (and the hedged web_search tool)
+_NUMBERED_RESULT = re.compile(r"^\[\d+\] ([^\n]*) \((\S+|no url)\)\n(.*?)(?=\n\[\d+\] |\Z)", re.M | re.S)
+
+# Tools such as Tavily return the repr of the exception instead of raising
+_ERROR_RESULT = re.compile(r"^\w*(Error|Exception)\(")
+
+# Tool name -> provider whose rate limit it counts against (see src.utils.rate_limit)
+TOOL_PROVIDERS = {
+    "google_serper_results_json": "serper",
+    "tavily_search_results_json": "tavily",
+    "duckduckgo_results_json": "duckduckgo",
+}
+
+_search_cache = None
+# refresh flag -> tool list (see build_search_tools)
+_search_tools = {}
+_agent_tools = {}
+_lock = threading.RLock()
+
+
+def normalize_query(query):
+    return " ".join(str(query).lower().split())
+
+
+def normalize_url(url):
+    url = re.sub(r"^https?://(www\.)?", "", url.strip().lower())
+    return url.split("#")[0].rstrip("/")
+
+
+def parse_search_results(result):
+    """Turn the output of any search tool into a list of {"title", "url", "snippet"} dicts."""
+    if isinstance(result, str):
+        text = result.strip()
+        if text.startswith("[1] "):
+            return [
+                {"title": title.strip(), "url": "" if url == "no url" else url, "snippet": snippet.strip()}
+                for title, url, snippet in _NUMBERED_RESULT.findall(text)
+            ] or [{"title": "", "url": "", "snippet": text}]
+        if text.startswith("{") or text.startswith("["):
+            try:
+                result = ast.literal_eval(text)
+            except (ValueError, SyntaxError):
+                return [{"title": "", "url": "", "snippet": text}] if text else []
+        else:
+            parsed = [
+                {"title": title.strip(), "url": link.strip(), "snippet": snippet.strip()}
+                for snippet, title, link in _DDG_RESULT.findall(text)
+            ]
+            return parsed or ([{"title": "", "url": "", "snippet": text}] if text else [])
+    items = []
+    if isinstance(result, dict):
+        # Serper: answer box and knowledge graph first, then organic results
+        for key in ("answerBox", "knowledgeGraph"):
+            box = result.get(key)
+            if isinstance(box, dict):
+                snippet = box.get("answer") or box.get("snippet") or box.get("description") or ""
+                attributes = box.get("attributes")
+                if isinstance(attributes, dict):
+                    snippet = "; ".join([snippet] + [f"{k}: {v}" for k, v in attributes.items()]).strip("; ")
+                items.append({"title": box.get("title", ""), "url": box.get("link") or box.get("descriptionLink") or "", "snippet": snippet})
+        result = result.get("organic", [])
+    if isinstance(result, (list, tuple)):
+        for item in result:
+            if isinstance(item, dict):
+                items.append({
+                    "title": item.get("title", ""),
+                    "url": item.get("link") or item.get("url") or "",
+                    "snippet": item.get("snippet") or item.get("content") or "",
+                })
+    return [item for item in items if item["snippet"] or item["url"]]
+
+
+def get_search_cache():
+    global _search_cache
+    if _search_cache is None:
+        with _lock:
+            if _search_cache is None:
+                _search_cache = TTLStore(
+                    SEARCH_CACHE_DB, table="search_results",
+                    ttl=SEARCH_CACHE_TTL, max_entries=SEARCH_CACHE_MAX_ENTRIES
+                )
+    return _search_cache
+
+
+def is_error_result(result):
+    return isinstance(result, str) and bool(_ERROR_RESULT.match(result))
+
+
+def _is_cacheable(result):
+    return bool(result) and not is_error_result(result)
+
+
+def cached_tool(tool, cache, refresh=False):
+    """Wrap a search tool so results are memoized by (provider, normalized query).
+
+    A ``refresh`` tool always searches and overwrites the memoized result.
+    """
+    from langchain_core.tools import Tool
+
+    # The wrapper is the tool the agent sees; keep the inner call out of the callback tree
+    inner_config = {"callbacks": []}
+
+    def run(query):
+        key = hash_key(tool.name, normalize_query(query))
+        result = None if refresh else cache.get(key)
+        if result is None:
+            result = tool.invoke(query, config=inner_config)
+            if _is_cacheable(result):
+                cache.set(key, result)
+        return result
+
+    async def arun(query):
+        key = hash_key(tool.name, normalize_query(query))
+        result = None if refresh else cache.get(key)
+        if result is None:
+            result = await tool.ainvoke(query, config=inner_config)
+            if _is_cacheable(result):
+                cache.set(key, result)
+        return result
+
+    return Tool(name=tool.name, description=tool.description, func=run, coroutine=arun)
+
+
+def rate_limited_tool(tool, limiter):
+    """Wrap a search tool so every call goes through its provider's shared rate limiter."""
+    from langchain_core.tools import Tool
+
+    inner_config = {"callbacks": []}
+
+    def run(query):
+        return limiter.call(lambda: tool.invoke(query, config=inner_config), is_error_result=is_error_result)
+
+    async def arun(query):
+        return await limiter.acall(lambda: tool.ainvoke(query, config=inner_config), is_error_result=is_error_result)
+
+    return Tool(name=tool.name, description=tool.description, func=run, coroutine=arun)
+
+
+def build_search_tools(refresh=False):
+    """Return the search tools shared by every section agent.
+
+    ``refresh`` tools skip the search cache but still update it (used by
+    forced runs and field refreshes).
+    """
+    if refresh not in _search_tools:
+        with _lock:
+            if refresh not in _search_tools:
+                # LangChain community tools are heavy to import; load them on first use
+                from langchain_community.tools import TavilySearchResults, GoogleSerperResults, DuckDuckGoSearchResults
+                from langchain_community.utilities import DuckDuckGoSearchAPIWrapper
+                from src.agents.search_wrappers import PooledSerperAPIWrapper, PooledTavilySearchAPIWrapper
+                from src.agents.hedged_search import timed_tool
+                from src.utils.rate_limit import get_limiter
+
+                tools = [
+                    GoogleSerperResults(api_wrapper=PooledSerperAPIWrapper()),
+                    TavilySearchResults(api_wrapper=PooledTavilySearchAPIWrapper()),
+                    DuckDuckGoSearchResults(api_wrapper=DuckDuckGoSearchAPIWrapper()),
+                ]
+                # Cache hits skip the rate limiter and latency tracking; only real provider calls count
+                tools = [rate_limited_tool(timed_tool(tool), get_limiter(TOOL_PROVIDERS[tool.name])) for tool in tools]
+                if SEARCH_CACHE_ENABLED:
+                    cache = get_search_cache()
+                    tools = [cached_tool(tool, cache, refresh=refresh) for tool in tools]
+                _search_tools[refresh] = tools
+    return list(_search_tools[refresh])
+
+
+def build_agent_tools(refresh=False):
+    """Return the tools the section agents see: the hedged web_search tool, or the providers themselves."""
+    if refresh not in _agent_tools:
+        with _lock:
+            if refresh not in _agent_tools:
+                tools = build_search_tools(refresh)
+                if HEDGED_SEARCH_ENABLED:
+                    from src.agents.hedged_search import hedged_search_tool
+                    tools = [hedged_search_tool(tools)]
+                _agent_tools[refresh] = tools
+    return list(_agent_tools[refresh])
+
+
+def render_tools(tools):
+    """Compact tool list for the ReAct prompt: one "name: first sentence of the description" line per tool."""
+    lines = []
+    for tool in tools:
+        description = " ".join(tool.description.split())
+        first_sentence = re.split(r"(?<=\.)\s", description, maxsplit=1)[0]
+        lines.append(f"{tool.name}: {first_sentence}")
+    return "\n".join(lines)
@@ -3,15 +3,15 @@ import os
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
 import streamlit as st
-from agents.basic_mission_data import BasicMissionData
-from agents.technical_data import TechnicalData
-from agents.launch_data import LaunchData
-from agents.cost_and_other_data import CostAndOtherData
 import json
+import time
 import re
 import io
 import pandas as pd
-from src.utils.cache import get_from_cache, save_to_cache, export_cache_as_rows
+from src.utils.cache import SECTIONS, export_cache_as_rows, cache_stats
+from src.agents.jobs import get_job_manager
+from src.agents.runner import cached_section
+from src.agents.registry import COMBINED
 
 st.set_page_config(page_title="Satellite Data Extraction", layout="wide")
 
@@ -50,6 +50,8 @@ page = st.sidebar.radio(
 
 st.sidebar.markdown('<div class="sidebar-section">🛰️ <b>Satellite Name</b></div>', unsafe_allow_html=True)
 satellite_name = st.sidebar.text_input("", value="Aditya-L1", key="sidebar_satellite_name", help="Enter the name of the satellite you want to query.")
+fast_mode = st.sidebar.toggle("⚡ Fast mode", value=False, key="sidebar_fast_mode", help="Run all searches at once and extract in a single step. Fields it cannot fill are handed to the step-by-step agent.")
+mode = "fast" if fast_mode else "react"
 
 st.sidebar.markdown('<hr style="margin: 1em 0;">', unsafe_allow_html=True)
 st.sidebar.info("Select a section and enter a satellite name to get started!", icon="ℹ️")
@@ -70,20 +72,11 @@ if 'thoughts' not in st.session_state:
         'cost': None
     }
 
-# --- AGENT STOP BUTTON LOGIC ---
-if 'stop_agent' not in st.session_state:
-    st.session_state['stop_agent'] = False
-
-if 'basic_running' not in st.session_state:
-    st.session_state['basic_running'] = False
-
-# Add running state flags for other agents
-if 'technical_running' not in st.session_state:
-    st.session_state['technical_running'] = False
-if 'launch_running' not in st.session_state:
-    st.session_state['launch_running'] = False
-if 'cost_running' not in st.session_state:
-    st.session_state['cost_running'] = False
+# --- BACKGROUND AGENT JOBS ---
+# Agents run on a process-wide background pool (src/agents/jobs.py); the session
+# only keeps the id of the job started for each section and polls it on every rerun.
+if 'jobs' not in st.session_state:
+    st.session_state['jobs'] = {}
 
 if 'basic_from_cache' not in st.session_state:
     st.session_state['basic_from_cache'] = False
@@ -94,27 +87,85 @@ if 'launch_from_cache' not in st.session_state:
 if 'cost_from_cache' not in st.session_state:
     st.session_state['cost_from_cache'] = False
 
-def stop_agent():
-    st.session_state['stop_agent'] = True
+# Seconds between reruns while a job of this session is still running
+POLL_INTERVAL = 1.0
+
+def stop_agent(key):
+    job_id = st.session_state['jobs'].get(key) or st.session_state['jobs'].get(COMBINED)
+    if job_id:
+        get_job_manager().cancel(job_id)
+
+def is_running(key):
+    return key in st.session_state['jobs'] or COMBINED in st.session_state['jobs']
 
-def reset_stop_agent():
-    st.session_state['stop_agent'] = False
+def show_result(key, result, from_cache):
+    st.session_state['results'][key] = result
+    st.session_state['thoughts'][key] = result.get('raw_output', None)
+    st.session_state[f'{key}_from_cache'] = from_cache
 
-def run_agent(agent, key, section, force_run=False):
+def run_agent(key, section, force_run=False):
     if not force_run:
-        cached = get_from_cache(satellite_name, section)
+        cached = cached_section(satellite_name, section)
         if cached:
-            st.session_state['results'][key] = cached
-            st.session_state['thoughts'][key] = cached.get('raw_output', None)
-            st.session_state[f'{key}_from_cache'] = True
+            show_result(key, cached, True)
             return
-    result = agent.call(satellite_name)
-    st.session_state['results'][key] = result
-    st.session_state['thoughts'][key] = result.get('raw_output', None)
-    st.session_state[f'{key}_from_cache'] = False
-    # Only save to cache if there is no error
-    if not (isinstance(result, dict) and 'error' in result):
-        save_to_cache(satellite_name, section, result)
+    if is_running(key):
+        return
+    st.session_state['jobs'][key] = get_job_manager().submit(satellite_name, section, force_run=force_run, mode=mode)
+
+def refresh_agent(key, section):
+    """Re-extract only the missing or stale fields of the cached section, keeping the rest."""
+    if is_running(key):
+        return
+    st.session_state['jobs'][key] = get_job_manager().submit(satellite_name, section, refresh=True)
+
+def run_all_agents(force_run=False, combined=False):
+    pending = []
+    for section in SECTIONS:
+        cached = None if force_run else cached_section(satellite_name, section)
+        if cached:
+            show_result(section, cached, True)
+        elif not is_running(section):
+            pending.append(section)
+    if not pending:
+        return
+    if combined:
+        # One agent session fills every missing section; its result is split per section
+        st.session_state['jobs'][COMBINED] = get_job_manager().submit(satellite_name, COMBINED, force_run=force_run, mode=mode)
+        return
+    # Missing sections run concurrently in the background and share one evidence bundle
+    st.session_state['jobs'].update(get_job_manager().submit_all(satellite_name, pending, force_run=force_run, mode=mode))
+
+def poll_jobs():
+    """Move the results of finished jobs into the session state."""
+    for key, job_id in list(st.session_state['jobs'].items()):
+        job = get_job_manager().get(job_id)
+        if job is None:
+            st.session_state['jobs'].pop(key)
+        elif job.finished:
+            st.session_state['jobs'].pop(key)
+            if job.result is None:
+                continue
+            if key == COMBINED:
+                for section, result in job.result.items():
+                    show_result(section, result, job.from_cache[section])
+            else:
+                show_result(key, job.result, job.from_cache)
+
+def render_job(key):
+    """Show the live Thought/Action/Observation steps of this section's running job."""
+    job_id = st.session_state['jobs'].get(key) or st.session_state['jobs'].get(COMBINED)
+    job = get_job_manager().get(job_id) if job_id else None
+    if job is None:
+        return
+    from src.agents.streaming import format_event
+    steps = sum(1 for event in job.events if event["type"] == "action")
+    label = f"Running agent for {job.satellite_name}... step {steps} ({job.elapsed}s)" if job.status == "running" else "Waiting for a free worker..."
+    with st.status(label, expanded=True):
+        for event in list(job.events):
+            st.markdown(format_event(event))
+
+poll_jobs()
 
 def render_links(data):
     if not isinstance(data, dict):
@@ -196,6 +247,27 @@ if page.startswith("🏠"):
     </div>
     """, unsafe_allow_html=True)
     st.markdown("---")
+
+    # Run every section agent for the selected satellite at once
+    st.subheader("Run All Sections")
+    col1, col2 = st.columns([2,1])
+    run_all_pressed = col1.button(f"Run All Sections for {satellite_name}", key="run_all", use_container_width=True)
+    force_all_pressed = col2.button("Force Re-Run All", key="force_all", use_container_width=True)
+    combined = st.checkbox("Use one combined agent for all sections", value=False, key="run_all_combined",
+                           help="A single agent session fills every section, sharing its searches between them. Usually fewer LLM calls and searches than four separate agents.")
+    if run_all_pressed or force_all_pressed:
+        run_all_agents(force_run=force_all_pressed, combined=combined)
+    running = [section for section in SECTIONS if is_running(section)]
+    if running:
+        st.info(f"⏳ Running in the background: {', '.join(running)}. You can open the section pages meanwhile.")
+    elif run_all_pressed or force_all_pressed or st.session_state.get('run_all_started'):
+        failed = [section for section in SECTIONS if isinstance(st.session_state['results'][section], dict) and 'error' in st.session_state['results'][section]]
+        if failed:
+            st.warning(f"Some sections failed: {', '.join(failed)}. Open the section pages for details.")
+        else:
+            st.success("All sections extracted. Open the section pages to view the results.")
+    st.session_state['run_all_started'] = bool(running)
+    st.markdown("---")
     st.caption("Developed with ❤️ using Streamlit and LangChain agents. UI will be enhanced with more features soon!")
 
     # Download all database as CSV
@@ -213,33 +285,39 @@ if page.startswith("🏠"):
         )
     else:
         st.info("No satellite data in the database yet.")
+    with st.expander("Cache statistics", expanded=False):
+        st.json(cache_stats())
+    with st.expander("Provider rate limits", expanded=False):
+        from src.utils.rate_limit import limiter_stats
+        st.json(limiter_stats())
+    with st.expander("Search provider latency (seconds)", expanded=False):
+        from src.agents.hedged_search import get_latency_tracker
+        st.json(get_latency_tracker().stats())
 
 if page.startswith("📝"):
     st.header("📝 Basic Mission Data")
     st.info("Extracts general mission details, orbit, and payload info.", icon="🛰️")
     st.markdown("<hr>", unsafe_allow_html=True)
-    col1, col2, col3 = st.columns([2,1,1])
+    col1, col2, col3, col4 = st.columns([2,1,1,1])
     run_pressed = col1.button("Run Basic Mission Agent", key="run_basic", use_container_width=True)
     stop_pressed = col2.button("Stop Agent", key="stop_basic", use_container_width=True)
-    force_pressed = col3.button("Force Re-Run", key="force_basic", use_container_width=True)
+    refresh_pressed = col3.button("Refresh Missing Fields", key="refresh_basic", use_container_width=True)
+    force_pressed = col4.button("Force Re-Run", key="force_basic", use_container_width=True)
     if run_pressed:
-        reset_stop_agent()
-        st.session_state['basic_running'] = True
-        run_agent(BasicMissionData(), 'basic', 'basic', force_run=False)
-        st.session_state['basic_running'] = False
+        run_agent('basic', 'basic')
     if stop_pressed:
-        stop_agent()
+        stop_agent('basic')
+    if refresh_pressed:
+        refresh_agent('basic', 'basic')
     if force_pressed:
-        reset_stop_agent()
-        st.session_state['basic_running'] = True
-        run_agent(BasicMissionData(), 'basic', 'basic', force_run=True)
-        st.session_state['basic_running'] = False
-    if st.session_state.get('stop_agent') and run_pressed:
-        st.warning("🛑 You have stopped the agent execution.")
-    if st.session_state.get('basic_running', False):
-        st.info("⏳ Agent is running in the background. Please wait...")
+        run_agent('basic', 'basic', force_run=True)
+    if is_running('basic'):
+        st.info("⏳ Agent is running in the background. You can switch pages; the result will appear here when it finishes.")
+        render_job('basic')
     if st.session_state['basic_from_cache']:
-        st.info("ℹ️ This data was previously stored in the database. You can force a fresh run above.")
+        st.info("ℹ️ This data was previously stored in the database. Out-of-date fields are refreshed in the background; you can also refresh its missing fields or force a fresh run above.")
+    if isinstance(st.session_state['results']['basic'], dict) and st.session_state['results']['basic'].get('stopped'):
+        st.warning(f"⚠️ The agent stopped early ({st.session_state['results']['basic']['stopped']}). Showing the fields found so far; they were not cached.")
     if st.session_state['results']['basic']:
         with st.expander("Show Agent's Thinking (Basic Mission Data)", expanded=False):
             raw_output = st.session_state['results']['basic'].get('raw_output')
@@ -252,7 +330,7 @@ if page.startswith("📝"):
         # Download section
         result = st.session_state['results']['basic']
         if isinstance(result, dict):
-            csv_data = {k: v for k, v in result.items() if k not in ('raw_output', 'error', 'satellite_name')}
+            csv_data = {k: v for k, v in result.items() if k not in ('raw_output', 'error', 'stopped', 'satellite_name')}
             df = pd.DataFrame([csv_data])
             csv_buffer = io.StringIO()
             df.to_csv(csv_buffer, index=False)
@@ -267,21 +345,21 @@ if page.startswith("🔬"):
     st.header("🔬 Technical Data")
     st.info("Extracts sensor specs, spectral bands, and technological breakthroughs.", icon="🔬")
     st.markdown("<hr>", unsafe_allow_html=True)
-    col1, col2 = st.columns([2,1])
+    col1, col2, col3 = st.columns([2,1,1])
     run_pressed = col1.button("Run Technical Data Agent", key="run_technical", use_container_width=True)
     stop_pressed = col2.button("Stop Agent", key="stop_technical", use_container_width=True)
+    refresh_pressed = col3.button("Refresh Missing Fields", key="refresh_technical", use_container_width=True)
     if run_pressed:
-        reset_stop_agent()
-        st.session_state['technical_running'] = True
-        with st.spinner("Running Technical Data Agent..."):
-            run_agent(TechnicalData(), 'technical', 'technical')
-        st.session_state['technical_running'] = False
+        run_agent('technical', 'technical')
     if stop_pressed:
-        stop_agent()
-    if st.session_state.get('stop_agent') and run_pressed:
-        st.warning("🛑 You have stopped the agent execution.")
-    if st.session_state.get('technical_running', False):
-        st.info("⏳ Agent is running in the background. Please wait...")
+        stop_agent('technical')
+    if refresh_pressed:
+        refresh_agent('technical', 'technical')
+    if is_running('technical'):
+        st.info("⏳ Agent is running in the background. You can switch pages; the result will appear here when it finishes.")
+        render_job('technical')
+    if isinstance(st.session_state['results']['technical'], dict) and st.session_state['results']['technical'].get('stopped'):
+        st.warning(f"⚠️ The agent stopped early ({st.session_state['results']['technical']['stopped']}). Showing the fields found so far; they were not cached.")
     if st.session_state['results']['technical']:
         with st.expander("Show Agent's Thinking (Technical Data)", expanded=False):
             raw_output = st.session_state['results']['technical'].get('raw_output')
@@ -294,7 +372,7 @@ if page.startswith("🔬"):
         # Download section
         result = st.session_state['results']['technical']
         if isinstance(result, dict):
-            csv_data = {k: v for k, v in result.items() if k not in ('raw_output', 'error', 'satellite_name')}
+            csv_data = {k: v for k, v in result.items() if k not in ('raw_output', 'error', 'stopped', 'satellite_name')}
             df = pd.DataFrame([csv_data])
             csv_buffer = io.StringIO()
             df.to_csv(csv_buffer, index=False)
@@ -309,21 +387,21 @@ if page.startswith("🚀"):
     st.header("🚀 Launch Data")
     st.info("Extracts launch mass, success, and reusability details.", icon="🚀")
     st.markdown("<hr>", unsafe_allow_html=True)
-    col1, col2 = st.columns([2,1])
+    col1, col2, col3 = st.columns([2,1,1])
     run_pressed = col1.button("Run Launch Data Agent", key="run_launch", use_container_width=True)
     stop_pressed = col2.button("Stop Agent", key="stop_launch", use_container_width=True)
+    refresh_pressed = col3.button("Refresh Missing Fields", key="refresh_launch", use_container_width=True)
     if run_pressed:
-        reset_stop_agent()
-        st.session_state['launch_running'] = True
-        with st.spinner("Running Launch Data Agent..."):
-            run_agent(LaunchData(), 'launch', 'launch')
-        st.session_state['launch_running'] = False
+        run_agent('launch', 'launch')
     if stop_pressed:
-        stop_agent()
-    if st.session_state.get('stop_agent') and run_pressed:
-        st.warning("🛑 You have stopped the agent execution.")
-    if st.session_state.get('launch_running', False):
-        st.info("⏳ Agent is running in the background. Please wait...")
+        stop_agent('launch')
+    if refresh_pressed:
+        refresh_agent('launch', 'launch')
+    if is_running('launch'):
+        st.info("⏳ Agent is running in the background. You can switch pages; the result will appear here when it finishes.")
+        render_job('launch')
+    if isinstance(st.session_state['results']['launch'], dict) and st.session_state['results']['launch'].get('stopped'):
+        st.warning(f"⚠️ The agent stopped early ({st.session_state['results']['launch']['stopped']}). Showing the fields found so far; they were not cached.")
     if st.session_state['results']['launch']:
         with st.expander("Show Agent's Thinking (Launch Data)", expanded=False):
             raw_output = st.session_state['results']['launch'].get('raw_output')
@@ -336,7 +414,7 @@ if page.startswith("🚀"):
         # Download section
         result = st.session_state['results']['launch']
         if isinstance(result, dict):
-            csv_data = {k: v for k, v in result.items() if k not in ('raw_output', 'error', 'satellite_name')}
+            csv_data = {k: v for k, v in result.items() if k not in ('raw_output', 'error', 'stopped', 'satellite_name')}
             df = pd.DataFrame([csv_data])
             csv_buffer = io.StringIO()
             df.to_csv(csv_buffer, index=False)
@@ -351,21 +429,21 @@ if page.startswith("💰"):
     st.header("💰 Cost & Other Data")
     st.info("Extracts mission cost, launch cost, vehicle type, and launch date.", icon="💰")
     st.markdown("<hr>", unsafe_allow_html=True)
-    col1, col2 = st.columns([2,1])
+    col1, col2, col3 = st.columns([2,1,1])
     run_pressed = col1.button("Run Cost & Other Data Agent", key="run_cost", use_container_width=True)
     stop_pressed = col2.button("Stop Agent", key="stop_cost", use_container_width=True)
+    refresh_pressed = col3.button("Refresh Missing Fields", key="refresh_cost", use_container_width=True)
     if run_pressed:
-        reset_stop_agent()
-        st.session_state['cost_running'] = True
-        with st.spinner("Running Cost & Other Data Agent..."):
-            run_agent(CostAndOtherData(), 'cost', 'cost')
-        st.session_state['cost_running'] = False
+        run_agent('cost', 'cost')
     if stop_pressed:
-        stop_agent()
-    if st.session_state.get('stop_agent') and run_pressed:
-        st.warning("🛑 You have stopped the agent execution.")
-    if st.session_state.get('cost_running', False):
-        st.info("⏳ Agent is running in the background. Please wait...")
+        stop_agent('cost')
+    if refresh_pressed:
+        refresh_agent('cost', 'cost')
+    if is_running('cost'):
+        st.info("⏳ Agent is running in the background. You can switch pages; the result will appear here when it finishes.")
+        render_job('cost')
+    if isinstance(st.session_state['results']['cost'], dict) and st.session_state['results']['cost'].get('stopped'):
+        st.warning(f"⚠️ The agent stopped early ({st.session_state['results']['cost']['stopped']}). Showing the fields found so far; they were not cached.")
     if st.session_state['results']['cost']:
         with st.expander("Show Agent's Thinking (Cost & Other Data)", expanded=False):
             raw_output = st.session_state['results']['cost'].get('raw_output')
@@ -378,7 +456,7 @@ if page.startswith("💰"):
         # Download section
         result = st.session_state['results']['cost']
         if isinstance(result, dict):
-            csv_data = {k: v for k, v in result.items() if k not in ('raw_output', 'error', 'satellite_name')}
+            csv_data = {k: v for k, v in result.items() if k not in ('raw_output', 'error', 'stopped', 'satellite_name')}
             df = pd.DataFrame([csv_data])
             csv_buffer = io.StringIO()
             df.to_csv(csv_buffer, index=False)
@@ -388,3 +466,8 @@ if page.startswith("💰"):
                 file_name=f"cost_data_{satellite_name}.csv",
                 mime="text/csv"
             )
+
+# Poll background jobs: rerun the script until every job of this session has finished
+if st.session_state['jobs']:
+    time.sleep(POLL_INTERVAL)
+    st.rerun()
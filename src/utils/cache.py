@@ -1,10 +1,50 @@
+import atexit
 import json
+from collections import OrderedDict
 import os
+import sqlite3
+import sys
+import threading
+import time
+
+try:
+    import fcntl
+except ImportError:  # Windows: fall back to in-process locking only
+    fcntl = None
 
 CACHE_FILE = os.path.join(os.path.dirname(__file__), '../../satellite_cache.json')
+CACHE_DB = os.path.join(os.path.dirname(__file__), '../../satellite_cache.db')
+CACHE_JOURNAL = os.path.join(os.path.dirname(__file__), '../../satellite_cache.journal')
+
+# "sqlite" (default), "journal" for snapshot + append-only journal,
+# or "json" for the legacy whole-file store
+CACHE_BACKEND = os.getenv("SATELLITE_CACHE_BACKEND", "sqlite")
+
+# Max (satellite, section) entries kept by the in-process read-through layer; 0 disables it
+CACHE_LRU_SIZE = int(os.getenv("SATELLITE_CACHE_LRU_SIZE", "1024"))
 
 SECTIONS = ["basic", "technical", "launch", "cost"]
 
+# Per-field metadata of a cached section is stored next to it under "<section>:fields"
+FIELDS_SUFFIX = ":fields"
+
+# Days a cached field stays fresh, per section; SATELLITE_<SECTION>_TTL_DAYS overrides, 0 never expires.
+# Stale sections are still served, and refreshed in the background (see runner.extract_section).
+SECTION_TTL_DAYS = {
+    "basic": 180,
+    "technical": 180,
+    "launch": 14,
+    "cost": 30,
+}
+
+# Satellites kept in the cache; the ones updated longest ago are evicted first (0: unbounded)
+CACHE_MAX_SATELLITES = int(os.getenv("SATELLITE_CACHE_MAX_SATELLITES", "5000"))
+# Eviction is checked once every this many cache writes
+EVICT_EVERY = 100
+
+# Serializes load-modify-save cycles when several threads write results
+_write_lock = threading.Lock()
+
 def normalize_satellite_name(name):
     return ''.join(e for e in name.lower() if e.isalnum())
 
@@ -24,27 +64,527 @@ def save_cache(cache):
     with open(CACHE_FILE, 'w') as f:
         json.dump(cache, f, indent=2)
 
+
+class JsonCacheStore:
+    """Legacy store: the whole cache lives in one JSON document (CACHE_FILE)."""
+
+    def get(self, key, section):
+        return load_cache().get(key, {}).get(section)
+
+    def set(self, key, section, data):
+        with _write_lock:
+            cache = load_cache()
+            if key not in cache:
+                cache[key] = {}
+            cache[key][section] = data
+            save_cache(cache)
+
+    def delete(self, key, section):
+        with _write_lock:
+            cache = load_cache()
+            if cache.get(key, {}).pop(section, None) is not None:
+                if not cache[key]:
+                    del cache[key]
+                save_cache(cache)
+
+    def items(self):
+        return list(load_cache().items())
+
+    def version(self):
+        try:
+            st = os.stat(CACHE_FILE)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+
+class SqliteCacheStore:
+    """Indexed store with one row per (satellite key, section).
+
+    Lookups and writes touch a single row through the primary key, and the
+    database runs in WAL mode so readers never block the writer. Each thread
+    gets its own connection. Every write bumps a version counter in the meta
+    table in the same transaction, so all connections and processes see the
+    same version.
+    """
+
+    def __init__(self, path, json_path=None):
+        self.path = path
+        self._local = threading.local()
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "CREATE TABLE IF NOT EXISTS sections ("
+                " satellite_key TEXT NOT NULL,"
+                " section TEXT NOT NULL,"
+                " data TEXT NOT NULL,"
+                " updated_at REAL NOT NULL,"
+                " PRIMARY KEY (satellite_key, section)"
+                ") WITHOUT ROWID"
+            )
+            conn.execute("CREATE INDEX IF NOT EXISTS idx_sections_updated_at ON sections (updated_at)")
+            conn.execute("CREATE TABLE IF NOT EXISTS meta (key TEXT PRIMARY KEY, value TEXT)")
+        if json_path:
+            self.migrate_from_json(json_path)
+
+    def _connect(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.path, timeout=30)
+            conn.execute("PRAGMA journal_mode=WAL")
+            conn.execute("PRAGMA synchronous=NORMAL")
+            self._local.conn = conn
+        return conn
+
+    def get(self, key, section):
+        row = self._connect().execute(
+            "SELECT data FROM sections WHERE satellite_key = ? AND section = ?", (key, section)
+        ).fetchone()
+        return json.loads(row[0]) if row else None
+
+    def set(self, key, section, data):
+        conn = self._connect()
+        with conn:
+            conn.execute(
+                "INSERT INTO sections (satellite_key, section, data, updated_at) VALUES (?, ?, ?, ?)"
+                " ON CONFLICT (satellite_key, section) DO UPDATE SET data = excluded.data, updated_at = excluded.updated_at",
+                (key, section, json.dumps(data), time.time())
+            )
+            self._bump_version(conn)
+
+    def delete(self, key, section):
+        conn = self._connect()
+        with conn:
+            conn.execute("DELETE FROM sections WHERE satellite_key = ? AND section = ?", (key, section))
+            self._bump_version(conn)
+
+    @staticmethod
+    def _bump_version(conn):
+        conn.execute(
+            "INSERT INTO meta (key, value) VALUES ('version', '1')"
+            " ON CONFLICT (key) DO UPDATE SET value = CAST(value AS INTEGER) + 1"
+        )
+
+    def version(self):
+        row = self._connect().execute("SELECT value FROM meta WHERE key = 'version'").fetchone()
+        return int(row[0]) if row else 0
+
+    def items(self):
+        satellites = {}
+        rows = self._connect().execute("SELECT satellite_key, section, data FROM sections ORDER BY satellite_key")
+        for key, section, data in rows:
+            satellites.setdefault(key, {})[section] = json.loads(data)
+        return list(satellites.items())
+
+    def migrate_from_json(self, json_path, force=False):
+        """Import a legacy satellite_cache.json once. Returns the number of sections imported.
+
+        Rows already in the database win over the JSON file, so re-running
+        the migration never overwrites newer results.
+        """
+        if not os.path.exists(json_path):
+            return 0
+        conn = self._connect()
+        with conn:
+            conn.execute("BEGIN IMMEDIATE")
+            done = conn.execute("SELECT value FROM meta WHERE key = 'json_migrated'").fetchone()
+            if done and not force:
+                return 0
+            try:
+                with open(json_path, 'r') as f:
+                    content = f.read().strip()
+                legacy = json.loads(content) if content else {}
+            except Exception as e:
+                print(f"Could not read legacy cache {json_path}: {e}")
+                return 0
+            now = time.time()
+            rows = [
+                (key, section, json.dumps(data), now)
+                for key, sat_data in legacy.items()
+                for section, data in sat_data.items()
+            ]
+            conn.executemany(
+                "INSERT OR IGNORE INTO sections (satellite_key, section, data, updated_at) VALUES (?, ?, ?, ?)", rows
+            )
+            conn.execute("INSERT OR REPLACE INTO meta (key, value) VALUES ('json_migrated', ?)", (str(now),))
+            self._bump_version(conn)
+        return len(rows)
+
+
+class JournalCacheStore:
+    """Append-only store: a JSON snapshot (CACHE_FILE format) plus a JSONL journal.
+
+    save appends one line to the journal, so writes cost O(1) regardless of
+    cache size; fsyncs are batched by a background thread. Reads are served
+    from an in-memory index built from the snapshot and replayed journal,
+    tailing new journal lines written by other processes. compact() folds
+    the journal into a new snapshot (written to a temp file and swapped in
+    with os.replace) and truncates the journal. It runs in the background
+    once the journal grows past compact_bytes.
+    """
+
+    def __init__(self, snapshot_path, journal_path, fsync_interval=0.2, fsync_batch=64, compact_bytes=4 * 1024 * 1024):
+        self.snapshot_path = snapshot_path
+        self.journal_path = journal_path
+        self.fsync_interval = fsync_interval
+        self.fsync_batch = fsync_batch
+        self.compact_bytes = compact_bytes
+        self._lock = threading.RLock()
+        self._index = {}
+        self._offset = 0
+        self._snapshot_id = None
+        self._unsynced = 0
+        self._compacting = False
+        self._fd = os.open(journal_path, os.O_WRONLY | os.O_APPEND | os.O_CREAT, 0o644)
+        self._lock_fd = os.open(journal_path + ".lock", os.O_RDWR | os.O_CREAT, 0o644)
+        self._wake = threading.Event()
+        threading.Thread(target=self._fsync_loop, name="cache-journal-fsync", daemon=True).start()
+        atexit.register(self.flush)
+
+    # -- cross-process locking -------------------------------------------------
+
+    def _file_lock(self):
+        if fcntl is not None:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_EX)
+
+    def _file_unlock(self):
+        if fcntl is not None:
+            fcntl.flock(self._lock_fd, fcntl.LOCK_UN)
+
+    # -- reading -----------------------------------------------------------------
+
+    def _stat_id(self, path):
+        try:
+            st = os.stat(path)
+        except FileNotFoundError:
+            return None
+        return (st.st_ino, st.st_mtime_ns, st.st_size)
+
+    def _refresh(self):
+        """Bring the in-memory index up to date with the snapshot and journal."""
+        with self._lock:
+            snapshot_id = self._stat_id(self.snapshot_path)
+            journal_id = self._stat_id(self.journal_path)
+            journal_size = journal_id[2] if journal_id else 0
+            if snapshot_id != self._snapshot_id or journal_size < self._offset:
+                # First load, or another process compacted: start from the new snapshot
+                self._index = self._read_snapshot()
+                self._snapshot_id = snapshot_id
+                self._offset = 0
+            if journal_size > self._offset:
+                with open(self.journal_path, 'rb') as f:
+                    f.seek(self._offset)
+                    chunk = f.read(journal_size - self._offset)
+                # Only consume complete lines; a partial tail is picked up next time
+                end = chunk.rfind(b"\n") + 1
+                for line in chunk[:end].splitlines():
+                    self._apply(line)
+                self._offset += end
+
+    def _read_snapshot(self):
+        try:
+            with open(self.snapshot_path, 'r') as f:
+                content = f.read().strip()
+            return json.loads(content) if content else {}
+        except FileNotFoundError:
+            return {}
+
+    def _apply(self, line):
+        try:
+            record = json.loads(line)
+        except ValueError:
+            return  # torn write from a crash; the record was never acknowledged
+        self._apply_record(record)
+
+    def _apply_record(self, record):
+        if record.get("deleted"):
+            sat_data = self._index.get(record["k"], {})
+            sat_data.pop(record["s"], None)
+            if not sat_data:
+                self._index.pop(record["k"], None)
+        else:
+            self._index.setdefault(record["k"], {})[record["s"]] = record["d"]
+
+    def get(self, key, section):
+        self._refresh()
+        return self._index.get(key, {}).get(section)
+
+    def items(self):
+        self._refresh()
+        with self._lock:
+            return [(key, dict(sat_data)) for key, sat_data in self._index.items()]
+
+    def version(self):
+        return (self._stat_id(self.snapshot_path), self._stat_id(self.journal_path))
+
+    # -- writing -----------------------------------------------------------------
+
+    def set(self, key, section, data):
+        self._append({"k": key, "s": section, "d": data, "t": time.time()})
+
+    def delete(self, key, section):
+        """Append a tombstone; compaction drops the section for good."""
+        self._append({"k": key, "s": section, "deleted": True, "t": time.time()})
+
+    def _append(self, record):
+        line = (json.dumps(record) + "\n").encode("utf-8")
+        with self._lock:
+            self._file_lock()
+            try:
+                os.write(self._fd, line)
+            finally:
+                self._file_unlock()
+            self._apply_record(record)
+            self._unsynced += 1
+            if self._unsynced >= self.fsync_batch:
+                self.flush()
+            else:
+                self._wake.set()
+            if not self._compacting and os.fstat(self._fd).st_size > self.compact_bytes:
+                self._compacting = True
+                threading.Thread(target=self._background_compact, name="cache-journal-compact", daemon=True).start()
+
+    def flush(self):
+        """fsync journal records written so far."""
+        with self._lock:
+            if self._unsynced:
+                os.fsync(self._fd)
+                self._unsynced = 0
+
+    def _fsync_loop(self):
+        while True:
+            self._wake.wait()
+            time.sleep(self.fsync_interval)
+            self._wake.clear()
+            try:
+                self.flush()
+            except OSError as e:
+                print(f"Error syncing cache journal: {e}")
+
+    # -- compaction --------------------------------------------------------------
+
+    def compact(self):
+        """Fold the journal into a fresh snapshot and truncate the journal."""
+        with self._lock:
+            self._file_lock()
+            try:
+                self._refresh()
+                tmp_path = f"{self.snapshot_path}.{os.getpid()}.tmp"
+                with open(tmp_path, 'w') as f:
+                    json.dump(self._index, f)
+                    f.flush()
+                    os.fsync(f.fileno())
+                os.replace(tmp_path, self.snapshot_path)
+                # A crash before this truncate only replays records the snapshot already holds
+                os.ftruncate(self._fd, 0)
+                os.fsync(self._fd)
+                self._unsynced = 0
+                self._snapshot_id = self._stat_id(self.snapshot_path)
+                self._offset = 0
+            finally:
+                self._file_unlock()
+
+    def _background_compact(self):
+        try:
+            self.compact()
+        except Exception as e:
+            print(f"Error compacting cache journal: {e}")
+        finally:
+            self._compacting = False
+
+
+class ReadThroughCache:
+    """Bounded in-process LRU in front of a store.
+
+    Entries (including misses) are kept until the backing store's version()
+    changes, i.e. until the file, database or journal is written by anyone,
+    so Streamlit reruns stop re-reading and re-parsing the store.
+    """
+
+    _MISSING = object()
+
+    def __init__(self, store, maxsize=1024):
+        self.store = store
+        self.maxsize = maxsize
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()
+        self._items = None
+        self._version = None
+        self.hits = 0
+        self.misses = 0
+        self.reloads = 0
+
+    def _check_version(self):
+        version = self.store.version()
+        if version != self._version:
+            if self._version is not None:
+                self.reloads += 1
+            self._entries.clear()
+            self._items = None
+            self._version = version
+
+    def get(self, key, section):
+        with self._lock:
+            self._check_version()
+            value = self._entries.get((key, section), self._MISSING)
+            if value is not self._MISSING:
+                self._entries.move_to_end((key, section))
+                self.hits += 1
+                return value
+            self.misses += 1
+            version = self._version
+        value = self.store.get(key, section)
+        with self._lock:
+            # A write in between may have made the value we read outdated
+            if self._version == version:
+                self._entries[(key, section)] = value
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+        return value
+
+    def set(self, key, section, data):
+        with self._lock:
+            unchanged = self.store.version() == self._version
+            self.store.set(key, section, data)
+            if unchanged:
+                # Our own write: keep the other entries and adopt the new version
+                self._version = self.store.version()
+                self._entries[(key, section)] = data
+                self._entries.move_to_end((key, section))
+                while len(self._entries) > self.maxsize:
+                    self._entries.popitem(last=False)
+                self._items = None
+            else:
+                self._version = None
+
+    def delete(self, key, section):
+        with self._lock:
+            self.store.delete(key, section)
+            self._entries.clear()
+            self._items = None
+            self._version = None
+
+    def items(self):
+        with self._lock:
+            self._check_version()
+            if self._items is not None:
+                self.hits += 1
+                return self._items
+            self.misses += 1
+            version = self._version
+        items = self.store.items()
+        with self._lock:
+            if self._version == version:
+                self._items = items
+        return items
+
+    def stats(self):
+        with self._lock:
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "reloads": self.reloads,
+                "entries": len(self._entries),
+                "maxsize": self.maxsize,
+            }
+
+
+_store = None
+_store_lock = threading.Lock()
+
+def get_store():
+    global _store
+    if _store is None:
+        with _store_lock:
+            if _store is None:
+                if CACHE_BACKEND == "json":
+                    store = JsonCacheStore()
+                elif CACHE_BACKEND == "journal":
+                    store = JournalCacheStore(CACHE_FILE, CACHE_JOURNAL)
+                else:
+                    store = SqliteCacheStore(CACHE_DB, json_path=CACHE_FILE)
+                if CACHE_LRU_SIZE > 0:
+                    store = ReadThroughCache(store, maxsize=CACHE_LRU_SIZE)
+                _store = store
+    return _store
+
+def cache_stats():
+    """Hit/miss counters of the in-process read-through layer (empty if disabled)."""
+    store = get_store()
+    return store.stats() if isinstance(store, ReadThroughCache) else {}
+
+def is_cacheable(result):
+    """Only complete results are cached; errors and stopped (partial) runs are retried later."""
+    return isinstance(result, dict) and "error" not in result and "stopped" not in result
+
 def get_from_cache(name, section):
-    cache = load_cache()
-    key = normalize_satellite_name(name)
-    return cache.get(key, {}).get(section)
+    return get_store().get(normalize_satellite_name(name), section)
+
+_writes_since_evict = 0
 
 def save_to_cache(name, section, data):
-    cache = load_cache()
-    key = normalize_satellite_name(name)
-    if key not in cache:
-        cache[key] = {}
-    cache[key][section] = data
-    save_cache(cache)
+    global _writes_since_evict
+    get_store().set(normalize_satellite_name(name), section, data)
+    with _write_lock:
+        _writes_since_evict += 1
+        due = _writes_since_evict >= EVICT_EVERY
+        if due:
+            _writes_since_evict = 0
+    if due and CACHE_MAX_SATELLITES > 0:
+        evict_satellites(CACHE_MAX_SATELLITES)
+
+def section_ttl(section):
+    """Seconds a cached field of this section stays fresh (0: never expires)."""
+    days = os.getenv(f"SATELLITE_{section.upper()}_TTL_DAYS")
+    return float(days if days else SECTION_TTL_DAYS.get(section, 0)) * 24 * 3600
+
+def _last_updated(sat_data):
+    times = [
+        field["updated_at"]
+        for section, metadata in sat_data.items() if section.endswith(FIELDS_SUFFIX)
+        for field in metadata.values()
+    ]
+    return max(times, default=0.0)
+
+def evict_satellites(max_satellites=CACHE_MAX_SATELLITES):
+    """Delete the satellites updated longest ago until at most max_satellites remain; returns how many went."""
+    store = get_store()
+    satellites = store.items()
+    excess = len(satellites) - max_satellites
+    if excess <= 0:
+        return 0
+    # items() may be the read-through layer's shared list; sort a copy.
+    # Satellites cached before field metadata existed count as the oldest
+    oldest = sorted(satellites, key=lambda item: _last_updated(item[1]))[:excess]
+    for key, sat_data in oldest:
+        for section in sat_data:
+            store.delete(key, section)
+    print(f"Evicted {excess} satellites from the cache (limit {max_satellites})")
+    return excess
+
+def get_field_metadata(name, section):
+    """{field: {"value", "source", "updated_at"}} recorded for a cached section ({} if none)."""
+    return get_store().get(normalize_satellite_name(name), section + FIELDS_SUFFIX) or {}
+
+def save_field_metadata(name, section, metadata):
+    get_store().set(normalize_satellite_name(name), section + FIELDS_SUFFIX, metadata)
 
 def export_cache_as_rows():
-    cache = load_cache()
     rows = []
-    for sat_name, sat_data in cache.items():
+    for sat_name, sat_data in get_store().items():
         row = {"satellite_name": sat_name}
         for section in SECTIONS:
             section_data = sat_data.get(section, {})
             for k, v in section_data.items():
                 row[f"{section}_{k}"] = v
         rows.append(row)
-    return rows 
\ No newline at end of file
+    return rows
+
+if __name__ == "__main__":
+    # python -m src.utils.cache migrate [path/to/satellite_cache.json]
+    if len(sys.argv) >= 2 and sys.argv[1] == "migrate":
+        json_path = sys.argv[2] if len(sys.argv) > 2 else CACHE_FILE
+        count = SqliteCacheStore(CACHE_DB).migrate_from_json(json_path, force=True)
+        print(f"Imported {count} cached sections from {json_path} into {CACHE_DB}")
+    else:
+        print("Usage: python -m src.utils.cache migrate [path/to/satellite_cache.json]")
@@ -1,5 +1,6 @@
 import os
-from typing import Optional, List
+import re
+from typing import Optional, List, Dict
 
 def read_txt_file(file_path: str, encoding: str = 'utf-8') -> Optional[str]:
     try:
@@ -12,3 +13,25 @@ def read_txt_file(file_path: str, encoding: str = 'utf-8') -> Optional[str]:
     except Exception as e:
         print(f"Error reading file {file_path}: {e}")
         return None
+
+_MISSING_VALUES = ("", "null", "none", "n/a", "unknown", "not found", "not available")
+
+def is_missing_value(value) -> bool:
+    """True for None, empty lists and placeholder strings such as "null" or "N/A"."""
+    if value is None:
+        return True
+    if isinstance(value, dict):
+        return not value
+    if isinstance(value, (list, tuple)):
+        return all(is_missing_value(v) for v in value)
+    return str(value).strip().lower() in _MISSING_VALUES
+
+def extract_field_values(text: str, fields: List[str]) -> Dict[str, Optional[str]]:
+    """Find `field: value` / `"field": "value"` mentions in free text (last mention wins)."""
+    values = {}
+    for field in fields:
+        pattern = re.compile(r'"?\b' + re.escape(field) + r'\b"?\s*[:=]\s*"?([^"\n]+?)"?\s*(?:,|\n|}|$)')
+        matches = [m.strip() for m in pattern.findall(text or "")]
+        matches = [m for m in matches if not is_missing_value(m)]
+        values[field] = matches[-1] if matches else None
+    return values
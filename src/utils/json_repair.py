@@ -0,0 +1,106 @@
+"""Tolerant extraction of the JSON object in an agent's final answer.
+
+LLM output is often almost JSON: a fence that is never closed, a trailing
+comma, Python literals, ``//`` comments copied from the format
+instructions, or an answer cut off mid-object. ``parse_json_object``
+finds the most plausible object in such text and repairs it locally.
+"""
+import ast
+import json
+import re
+
+_FENCE = re.compile(r"```(?:json)?\s*(.*?)(?:```|$)", re.S | re.I)
+_COMMENT = re.compile(r"(?<=[\s,{\[])//[^\n]*")
+_TRAILING_COMMA = re.compile(r",\s*([}\]])")
+# A value on one line and the next key on the following line, without a comma
+_MISSING_COMMA = re.compile(r'("|\d|null|true|false|[}\]])(\s*\n\s*")')
+_PYTHON_LITERALS = {"None": "null", "True": "true", "False": "false"}
+
+
+def _candidates(text):
+    """Fenced blocks first, then everything from the first brace on."""
+    candidates = [block.strip() for block in _FENCE.findall(text) if "{" in block]
+    start = text.find("{")
+    if start != -1:
+        candidates.append(text[start:])
+    return candidates
+
+
+def _outside_strings(text, fn):
+    """Apply fn to the parts of text that are not inside double-quoted strings."""
+    parts = re.split(r'("(?:\\.|[^"\\])*")', text)
+    return "".join(part if i % 2 else fn(part) for i, part in enumerate(parts))
+
+
+def _close(text):
+    """Close the arrays and objects a truncated answer left open.
+
+    A value the answer was cut off in (an unclosed string, or a bare
+    number or literal right at the end) may be incomplete, so it is
+    dropped together with its key rather than closed.
+    """
+    stack = []
+    in_string = escaped = False
+    string_start = 0
+    for i, ch in enumerate(text):
+        if in_string:
+            if escaped:
+                escaped = False
+            elif ch == "\\":
+                escaped = True
+            elif ch == '"':
+                in_string = False
+        elif ch == '"':
+            in_string = True
+            string_start = i
+        elif ch in "{[":
+            stack.append("}" if ch == "{" else "]")
+        elif ch in "}]" and stack and stack[-1] == ch:
+            stack.pop()
+    if in_string:
+        text = text[:string_start]
+    elif stack:
+        text = re.sub(r"[\w.+-]+\s*$", "", text)
+    text = text.rstrip()
+    # Drop a key that never got its value, and a comma that never got its next key
+    text = re.sub(r',?\s*"[^"]*"\s*:\s*$', "", text)
+    text = re.sub(r",\s*$", "", text)
+    return text + "".join(reversed(stack))
+
+
+def repair_json(text):
+    """Best-effort local fixes for near-JSON object text."""
+    text = text.strip()
+
+    def fix(part):
+        part = _COMMENT.sub("", part)
+        return re.sub(r"\b(None|True|False)\b", lambda m: _PYTHON_LITERALS[m.group(1)], part)
+
+    text = _outside_strings(text, fix)
+    text = _MISSING_COMMA.sub(r"\1,\2", text)
+    text = _close(text)
+    return _TRAILING_COMMA.sub(r"\1", text)
+
+
+def _load(text):
+    try:
+        value, _ = json.JSONDecoder().raw_decode(text)
+        return value
+    except ValueError:
+        pass
+    try:
+        return ast.literal_eval(text)
+    except (ValueError, SyntaxError, MemoryError, RecursionError):
+        return None
+
+
+def parse_json_object(text):
+    """The first JSON object that can be read from text, repairing it if needed; None if there is none."""
+    if not text:
+        return None
+    for candidate in _candidates(text):
+        for attempt in (candidate, repair_json(candidate)):
+            value = _load(attempt)
+            if isinstance(value, dict):
+                return value
+    return None
@@ -0,0 +1,72 @@
+import os
+import threading
+
+from langchain_core.caches import BaseCache
+from langchain_core.load import dumps, loads
+
+from src.utils.ttl_store import TTLStore, hash_key
+
+LLM_CACHE_DB = os.path.join(os.path.dirname(__file__), '../../llm_cache.db')
+LLM_CACHE_TTL = int(os.getenv("SATELLITE_LLM_CACHE_TTL", str(7 * 24 * 3600)))
+LLM_CACHE_MAX_ENTRIES = int(os.getenv("SATELLITE_LLM_CACHE_MAX_ENTRIES", "10000"))
+LLM_CACHE_ENABLED = os.getenv("SATELLITE_LLM_CACHE", "1") != "0"
+
+
+class TTLLLMCache(BaseCache):
+    """Exact-match LangChain LLM cache backed by a TTLStore.
+
+    LangChain calls lookup/update with the rendered prompt and an llm_string
+    that serializes the model name and all call parameters (temperature,
+    stop sequences, ...). Entries are keyed by a hash of both.
+
+    With ``read=False`` the cache only records responses: every call goes
+    to the model and its fresh answer replaces the stored one.
+    """
+
+    def __init__(self, store, read=True):
+        self.store = store
+        self.read = read
+
+    def lookup(self, prompt, llm_string):
+        if not self.read:
+            return None
+        value = self.store.get(hash_key(llm_string, prompt))
+        if value is None:
+            return None
+        try:
+            return [loads(generation) for generation in value]
+        except Exception as e:
+            print(f"Ignoring unreadable LLM cache entry: {e}")
+            return None
+
+    def update(self, prompt, llm_string, return_val):
+        self.store.set(hash_key(llm_string, prompt), [dumps(generation) for generation in return_val])
+
+    def clear(self, **kwargs):
+        self.store.clear()
+
+
+_llm_store = None
+_llm_caches = {}
+_lock = threading.Lock()
+
+
+def get_llm_cache(refresh=False):
+    """Process-wide default LLM cache, or None when SATELLITE_LLM_CACHE=0.
+
+    ``refresh=True`` returns the write-only view used by forced runs and
+    field refreshes, so they never replay a cached answer.
+    """
+    global _llm_store
+    if not LLM_CACHE_ENABLED:
+        return None
+    if refresh not in _llm_caches:
+        with _lock:
+            if _llm_store is None:
+                _llm_store = TTLStore(
+                    LLM_CACHE_DB, table="llm_responses",
+                    ttl=LLM_CACHE_TTL, max_entries=LLM_CACHE_MAX_ENTRIES
+                )
+            if refresh not in _llm_caches:
+                _llm_caches[refresh] = TTLLLMCache(_llm_store, read=not refresh)
+    return _llm_caches[refresh]
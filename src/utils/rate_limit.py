@@ -0,0 +1,302 @@
+"""Process-wide, self-tuning rate limits for Gemini and the search providers.
+
+Every provider gets one AdaptiveRateLimiter shared by all agents and threads:
+a token bucket caps requests per second and a concurrency limit caps requests
+in flight. Both adapt AIMD-style to what the provider tells us: a rate-limit
+error (HTTP 429, quota exhausted) halves them and pauses the provider with
+exponential backoff, and a run of successes grows them back towards the
+configured ceiling.
+
+Ceilings are configured per provider with SATELLITE_<PROVIDER>_QPS and
+SATELLITE_<PROVIDER>_CONCURRENCY, e.g. SATELLITE_GEMINI_QPS=2.
+"""
+import asyncio
+import contextvars
+import os
+import random
+import re
+import threading
+import time
+
+from langchain_core.callbacks import BaseCallbackHandler
+from langchain_core.rate_limiters import BaseRateLimiter
+
+# provider -> (requests per second, requests in flight)
+DEFAULT_LIMITS = {
+    "gemini": (4.0, 8),
+    "serper": (5.0, 8),
+    "tavily": (2.0, 4),
+    "duckduckgo": (1.0, 2),
+}
+# Longest pause after repeated rate-limit errors, in seconds
+MAX_BACKOFF = 60.0
+# Attempts per call before a rate-limit error is passed on to the agent
+DEFAULT_RETRIES = 3
+
+# The chat model call in progress: set by RateLimitFeedbackHandler when the
+# call starts, marked by LangChainRateLimiter when it takes a concurrency slot
+_llm_call = contextvars.ContextVar("rate_limit_llm_call", default=None)
+
+_RATE_LIMIT_TEXT = re.compile(r"\b429\b|rate.?limit|too many requests|resource.?exhausted|quota", re.I)
+
+
+class RateLimitedError(Exception):
+    """Raised when a provider still rate-limits a call after all retries."""
+
+
+def is_rate_limit_error(error):
+    """True if an exception (or a tool's error string) means the provider is rate-limiting us."""
+    response = getattr(error, "response", None)
+    if getattr(response, "status_code", None) == 429 or getattr(error, "code", None) == 429:
+        return True
+    if type(error).__name__ in ("ResourceExhausted", "RateLimitError", "RatelimitException", "RateLimitedError"):
+        return True
+    return bool(_RATE_LIMIT_TEXT.search(str(error)))
+
+
+def _retry_after(error):
+    response = getattr(error, "response", None)
+    try:
+        return float(response.headers.get("Retry-After"))
+    except (AttributeError, TypeError, ValueError):
+        return None
+
+
+class AdaptiveRateLimiter:
+    """Token bucket plus concurrency limit for one provider, adapted on rate-limit feedback."""
+
+    def __init__(self, name, qps, max_concurrency):
+        self.name = name
+        self.max_qps = qps
+        self.min_qps = qps / 16
+        self.qps = qps
+        self.max_concurrency = max_concurrency
+        self.concurrency = max_concurrency
+        self._tokens = max(1.0, qps)
+        self._updated = time.monotonic()
+        self._in_flight = 0
+        self._paused_until = 0.0
+        self._backoff = 0.0
+        self._successes = 0
+        self._cond = threading.Condition()
+        self.calls = 0
+        self.rate_limited = 0
+
+    def _try_acquire(self, slot):
+        """Take a token (and a slot); return 0 on success, else the seconds to wait (None: until a release)."""
+        now = time.monotonic()
+        self._tokens = min(max(1.0, self.qps), self._tokens + (now - self._updated) * self.qps)
+        self._updated = now
+        if now < self._paused_until:
+            return self._paused_until - now
+        if slot and self._in_flight >= self.concurrency:
+            return None
+        if self._tokens < 1:
+            return (1 - self._tokens) / self.qps
+        self._tokens -= 1
+        self._in_flight += 1 if slot else 0
+        self.calls += 1
+        return 0
+
+    def acquire(self, slot=True, blocking=True):
+        with self._cond:
+            while True:
+                wait = self._try_acquire(slot)
+                if wait == 0:
+                    return True
+                if not blocking:
+                    return False
+                self._cond.wait(wait)
+
+    async def aacquire(self, slot=True, blocking=True):
+        while True:
+            with self._cond:
+                wait = self._try_acquire(slot)
+            if wait == 0:
+                return True
+            if not blocking:
+                return False
+            await asyncio.sleep(wait if wait is not None else 0.05)
+
+    def has_capacity(self):
+        """True if a call could take a slot now, i.e. the provider is neither paused nor at its concurrency limit."""
+        with self._cond:
+            return time.monotonic() >= self._paused_until and self._in_flight < self.concurrency
+
+    def release(self):
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def on_success(self):
+        with self._cond:
+            self._backoff = 0.0
+            self._successes += 1
+            # Additive increase: one step per window of successful calls
+            if self._successes >= self.concurrency:
+                self._successes = 0
+                self.concurrency = min(self.max_concurrency, self.concurrency + 1)
+                self.qps = min(self.max_qps, self.qps + self.max_qps / 8)
+            self._cond.notify_all()
+
+    def on_rate_limited(self, retry_after=None):
+        with self._cond:
+            self.rate_limited += 1
+            self._successes = 0
+            # Multiplicative decrease, plus a pause with jittered exponential backoff
+            self.concurrency = max(1, self.concurrency // 2)
+            self.qps = max(self.min_qps, self.qps / 2)
+            self._backoff = min(MAX_BACKOFF, self._backoff * 2 or 1.0)
+            pause = retry_after if retry_after is not None else self._backoff * random.uniform(0.5, 1.5)
+            self._paused_until = max(self._paused_until, time.monotonic() + pause)
+            self._tokens = 0.0
+        print(f"{self.name} is rate-limiting requests; now {self.qps:.2f} req/s, {self.concurrency} in flight")
+
+    def call(self, fn, retries=DEFAULT_RETRIES, is_error_result=None):
+        """Run fn() under the limiter, retrying rate-limited calls after backing off.
+
+        ``is_error_result`` recognises tools that return an error string
+        instead of raising.
+        """
+        for attempt in range(retries):
+            self.acquire()
+            try:
+                result = fn()
+            except Exception as e:
+                if not is_rate_limit_error(e):
+                    raise
+                self.on_rate_limited(_retry_after(e))
+                if attempt == retries - 1:
+                    raise
+                continue
+            finally:
+                self.release()
+            if is_error_result is not None and is_error_result(result) and is_rate_limit_error(result):
+                self.on_rate_limited()
+                if attempt == retries - 1:
+                    raise RateLimitedError(f"{self.name}: {result}")
+                continue
+            self.on_success()
+            return result
+
+    async def acall(self, coro_fn, retries=DEFAULT_RETRIES, is_error_result=None):
+        for attempt in range(retries):
+            await self.aacquire()
+            try:
+                result = await coro_fn()
+            except Exception as e:
+                if not is_rate_limit_error(e):
+                    raise
+                self.on_rate_limited(_retry_after(e))
+                if attempt == retries - 1:
+                    raise
+                continue
+            finally:
+                self.release()
+            if is_error_result is not None and is_error_result(result) and is_rate_limit_error(result):
+                self.on_rate_limited()
+                if attempt == retries - 1:
+                    raise RateLimitedError(f"{self.name}: {result}")
+                continue
+            self.on_success()
+            return result
+
+    def stats(self):
+        with self._cond:
+            return {
+                "qps": round(self.qps, 3),
+                "concurrency": self.concurrency,
+                "in_flight": self._in_flight,
+                "calls": self.calls,
+                "rate_limited": self.rate_limited,
+                "paused_for": round(max(0.0, self._paused_until - time.monotonic()), 1),
+            }
+
+
+class LangChainRateLimiter(BaseRateLimiter):
+    """Lets a chat model take its request tokens and concurrency slots from a shared AdaptiveRateLimiter.
+
+    LangChain acquires before every call that misses the LLM cache but has no
+    release hook, so a slot is only taken when the model also carries a
+    RateLimitFeedbackHandler for the same limiter, which releases it when the
+    call ends. Without one, only request tokens are taken.
+    """
+
+    def __init__(self, limiter):
+        self.limiter = limiter
+
+    def _call(self):
+        call = _llm_call.get()
+        return call if call is not None and call["limiter"] is self.limiter and not call["slot"] else None
+
+    def acquire(self, *, blocking=True):
+        call = self._call()
+        acquired = self.limiter.acquire(slot=call is not None, blocking=blocking)
+        if acquired and call is not None:
+            call["slot"] = True
+        return acquired
+
+    async def aacquire(self, *, blocking=True):
+        call = self._call()
+        acquired = await self.limiter.aacquire(slot=call is not None, blocking=blocking)
+        if acquired and call is not None:
+            call["slot"] = True
+        return acquired
+
+
+class RateLimitFeedbackHandler(BaseCallbackHandler):
+    """Reports a chat model's successes and rate-limit errors back to its limiter.
+
+    Also releases the concurrency slot the call took in LangChainRateLimiter
+    (calls answered from the LLM cache never took one).
+    """
+
+    # Called in the caller's context, so on_chat_model_start can mark the call
+    # for the rate limiter, which LangChain runs in a copy of that context
+    run_inline = True
+
+    def __init__(self, limiter):
+        self.limiter = limiter
+
+    def on_chat_model_start(self, serialized, messages, **kwargs):
+        _llm_call.set({"limiter": self.limiter, "slot": False})
+
+    def _release(self):
+        call = _llm_call.get()
+        if call is not None and call["limiter"] is self.limiter and call["slot"]:
+            call["slot"] = False
+            self.limiter.release()
+
+    def on_llm_end(self, response, **kwargs):
+        self._release()
+        self.limiter.on_success()
+
+    def on_llm_error(self, error, **kwargs):
+        self._release()
+        if is_rate_limit_error(error):
+            self.limiter.on_rate_limited(_retry_after(error))
+
+
+_limiters = {}
+_lock = threading.Lock()
+
+
+def get_limiter(provider):
+    """Return the process-wide limiter for a provider ("gemini", "serper", "tavily", "duckduckgo")."""
+    limiter = _limiters.get(provider)
+    if limiter is None:
+        with _lock:
+            limiter = _limiters.get(provider)
+            if limiter is None:
+                qps, concurrency = DEFAULT_LIMITS.get(provider, (2.0, 4))
+                prefix = f"SATELLITE_{provider.upper()}"
+                qps = float(os.getenv(f"{prefix}_QPS", qps))
+                concurrency = int(os.getenv(f"{prefix}_CONCURRENCY", concurrency))
+                limiter = _limiters[provider] = AdaptiveRateLimiter(provider, qps, concurrency)
+    return limiter
+
+
+def limiter_stats():
+    with _lock:
+        limiters = dict(_limiters)
+    return {name: limiter.stats() for name, limiter in limiters.items()}
@@ -0,0 +1,98 @@
+import asyncio
+import threading
+
+
+class _Call:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = None
+        self.error = None
+        # (loop, future) of async callers waiting for this call
+        self.waiters = []
+
+
+def _wake(future):
+    if not future.done():
+        future.set_result(None)
+
+
+class SingleFlight:
+    """Coalesces concurrent calls that share a key into one execution.
+
+    The first caller for a key runs the function; callers arriving while it
+    is in flight wait for it and receive the same result (or exception).
+    Nothing is remembered once the call finishes, so this deduplicates work
+    in flight only; caching results is up to the caller. Sync and async
+    callers of the same instance coalesce with each other.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+
+    def _join(self, key):
+        """Return (call, leader) for key, registering a new call if none is in flight."""
+        with self._lock:
+            call = self._calls.get(key)
+            if call is not None:
+                return call, False
+            call = self._calls[key] = _Call()
+            return call, True
+
+    def _finish(self, key, call, result=None, error=None):
+        call.result, call.error = result, error
+        with self._lock:
+            self._calls.pop(key, None)
+            call.done.set()
+            waiters, call.waiters = call.waiters, []
+        for loop, future in waiters:
+            try:
+                loop.call_soon_threadsafe(_wake, future)
+            except RuntimeError:
+                pass  # the waiter's loop is closed; nobody is left to wake
+
+    @staticmethod
+    def _outcome(call):
+        if call.error is not None:
+            raise call.error
+        return call.result, True
+
+    def do(self, key, fn):
+        """Run fn() once per key in flight; returns (result, shared)."""
+        call, leader = self._join(key)
+        if not leader:
+            call.done.wait()
+            return self._outcome(call)
+        try:
+            result = fn()
+        except BaseException as e:
+            self._finish(key, call, error=e)
+            raise
+        self._finish(key, call, result=result)
+        return result, False
+
+    async def ado(self, key, coro_fn):
+        """Async counterpart of ``do``; coro_fn() must return an awaitable."""
+        call, leader = self._join(key)
+        if not leader:
+            # Wait on a future of our own loop rather than blocking an executor thread
+            loop = asyncio.get_running_loop()
+            future = loop.create_future()
+            with self._lock:
+                waiting = not call.done.is_set()
+                if waiting:
+                    call.waiters.append((loop, future))
+            if waiting:
+                await future
+            return self._outcome(call)
+        try:
+            result = await coro_fn()
+        except BaseException as e:
+            self._finish(key, call, error=e)
+            raise
+        self._finish(key, call, result=result)
+        return result, False
+
+    def in_flight(self, key):
+        with self._lock:
+            return key in self._calls
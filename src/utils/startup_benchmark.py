@@ -0,0 +1,89 @@
+"""Cold-import benchmark for the app's modules.
+
+Usage:
+    python -m src.utils.startup_benchmark [module ...] [--repeat 5] [--top 10]
+
+Each module is imported in a fresh interpreter (so nothing is cached in
+sys.modules) and the import is timed. The median over --repeat runs is
+reported, along with the slowest transitive imports according to
+``python -X importtime``.
+"""
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+
+DEFAULT_MODULES = [
+    "src.utils.cache",
+    "src.agents",
+    "src.agents.tools",
+    "src.agents.base",
+    "src.agents.basic_mission_data",
+    "src.agents.technical_data",
+    "src.agents.launch_data",
+    "src.agents.cost_and_other_data",
+    "src.agents.registry",
+    "src.agents.runner",
+    # What an agent pays on its first run
+    "langchain.agents",
+    "langchain_google_genai",
+    "langchain_community.tools",
+]
+
+_TIMER = "import time; t = time.perf_counter(); import {module}; print(time.perf_counter() - t)"
+
+
+def _run(args):
+    env = dict(os.environ, PYTHONPATH=PROJECT_ROOT + os.pathsep + os.environ.get("PYTHONPATH", ""))
+    return subprocess.run([sys.executable] + args, capture_output=True, text=True, cwd=PROJECT_ROOT, env=env)
+
+
+def time_import(module, repeat=5):
+    """Median cold-import time of module in seconds, or None if the import fails."""
+    samples = []
+    for _ in range(repeat):
+        proc = _run(["-c", _TIMER.format(module=module)])
+        if proc.returncode != 0:
+            return None
+        samples.append(float(proc.stdout.strip().splitlines()[-1]))
+    return statistics.median(samples)
+
+
+def slowest_imports(module, top=10):
+    """Return [(cumulative_seconds, name)] for the slowest imports triggered by module."""
+    proc = _run(["-X", "importtime", "-c", f"import {module}"])
+    entries = []
+    for line in proc.stderr.splitlines():
+        # import time: self [us] | cumulative | imported package
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        try:
+            _, cumulative, name = line[len("import time:"):].split("|")
+            entries.append((int(cumulative) / 1e6, name.strip()))
+        except ValueError:
+            continue
+    return sorted(entries, reverse=True)[:top]
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Report cold-import time per module.")
+    parser.add_argument("modules", nargs="*", default=DEFAULT_MODULES)
+    parser.add_argument("--repeat", type=int, default=5)
+    parser.add_argument("--top", type=int, default=0, help="Also list the N slowest transitive imports per module")
+    args = parser.parse_args(argv)
+
+    print(f"{'module':45} {'cold import (ms)':>16}")
+    print("-" * 62)
+    for module in args.modules:
+        seconds = time_import(module, args.repeat)
+        print(f"{module:45} {'failed' if seconds is None else f'{seconds * 1000:16.1f}':>16}")
+        if args.top and seconds is not None:
+            for cumulative, name in slowest_imports(module, args.top):
+                print(f"    {name:41} {cumulative * 1000:16.1f}")
+
+
+if __name__ == "__main__":
+    main()
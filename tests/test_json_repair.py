@@ -0,0 +1,71 @@
+from src.utils.json_repair import parse_json_object, repair_json
+
+
+def test_plain_object():
+    assert parse_json_object('{"altitude": "505 km", "orbit": null}') == {"altitude": "505 km", "orbit": None}
+
+
+def test_no_object():
+    assert parse_json_object("I could not find anything.") is None
+    assert parse_json_object("") is None
+
+
+def test_fenced_block_with_surrounding_text():
+    text = 'Final Answer: here you go\n```json\n{"altitude": "505 km"}\n```\nHope this helps {not json}'
+    assert parse_json_object(text) == {"altitude": "505 km"}
+
+
+def test_unclosed_fence():
+    assert parse_json_object('```json\n{"altitude": "505 km"}') == {"altitude": "505 km"}
+
+
+def test_comments_are_removed():
+    text = '{\n  "altitude": "505 km", // orbit height\n  "source": "https://www.isro.gov.in/a"\n}'
+    assert parse_json_object(text) == {"altitude": "505 km", "source": "https://www.isro.gov.in/a"}
+
+
+def test_trailing_commas():
+    assert parse_json_object('{"payloads": ["PAN", "MX",], "altitude": "505 km",}') == {
+        "payloads": ["PAN", "MX"],
+        "altitude": "505 km",
+    }
+
+
+def test_missing_comma_between_lines():
+    assert parse_json_object('{\n"a": "x"\n"b": 2\n}') == {"a": "x", "b": 2}
+
+
+def test_python_literals():
+    assert parse_json_object("{'launch_success': True, 'cost': None}") == {"launch_success": True, "cost": None}
+    assert parse_json_object('{"launch_success": True, "cost": None, "note": "None"}') == {
+        "launch_success": True,
+        "cost": None,
+        "note": "None",
+    }
+
+
+def test_truncated_after_complete_value():
+    assert parse_json_object('{"altitude": "505 km", "orbit": "SSO"') == {"altitude": "505 km", "orbit": "SSO"}
+    assert parse_json_object('{"altitude": "505 km", ') == {"altitude": "505 km"}
+    assert parse_json_object('{"altitude": "505 km", "orbit": ') == {"altitude": "505 km"}
+
+
+def test_truncated_inside_string_value_drops_it():
+    assert parse_json_object('```json\n{"altitude": "50') == {}
+    assert parse_json_object('{"orbit": "SSO", "altitude": "50') == {"orbit": "SSO"}
+
+
+def test_truncated_inside_key_drops_it():
+    assert parse_json_object('{"orbit": "SSO", "alti') == {"orbit": "SSO"}
+
+
+def test_truncated_number_drops_it():
+    assert parse_json_object('{"orbit": "SSO", "payloads": 1') == {"orbit": "SSO"}
+
+
+def test_truncated_nested():
+    assert parse_json_object('{"orbit": "SSO", "payloads": ["PAN", "M') == {"orbit": "SSO", "payloads": ["PAN"]}
+
+
+def test_repair_leaves_braces_in_strings_alone():
+    assert repair_json('{"note": "uses {braces} and [brackets]"}') == '{"note": "uses {braces} and [brackets]"}'